@@ -1,16 +1,11 @@
 import streamlit as st
 from presentation.state.session_state_manager import initialize_session_state
+from presentation.components.profile_panel import render_profile
 from shared.narratives import USAGE, DETAILS, NAVIGATION, DISCLAIMER
 
-import argparse
-
-parser = argparse.ArgumentParser()
-parser.add_argument("--debug", type=bool, default=False)
-args = parser.parse_args()
-
 
 def main():
-    initialize_session_state(debug=args.debug)
+    initialize_session_state()
 
     st.sidebar.title("Navigation")
     st.sidebar.markdown(NAVIGATION)
@@ -24,6 +19,8 @@ def main():
     st.sidebar.title("Disclaimer")
     st.sidebar.markdown(DISCLAIMER)
 
+    render_profile()
+
 
 if __name__ == "__main__":
     main()
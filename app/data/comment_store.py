@@ -0,0 +1,194 @@
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+from shared.colored_logging import info, debug, warning
+
+COMMENTS_DB = "comments.db"
+LEGACY_COMMENTS_FILE = "comments.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    quarter TEXT NOT NULL,
+    lob TEXT NOT NULL,
+    uwy INTEGER NOT NULL,
+    comment TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (quarter, lob, uwy)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS comment_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    quarter TEXT NOT NULL,
+    lob TEXT NOT NULL,
+    uwy INTEGER NOT NULL,
+    old_comment TEXT,
+    new_comment TEXT NOT NULL,
+    author TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comment_history_key
+    ON comment_history (quarter, lob, uwy);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class CommentStore:
+    """
+    LOB/UWY commentary per quarter, stored in SQLite.
+
+    Comments are keyed by (quarter, LOB, UWY). Saving upserts only the
+    comments that changed, in one transaction, and records every change in
+    `comment_history`. SQLite's write lock serialises concurrent sessions, so
+    two users saving at once can no longer overwrite each other's comments.
+    The legacy `comments.json` is imported once, on first use after it is found.
+    """
+
+    def __init__(self, path: str = COMMENTS_DB, legacy_path: str = LEGACY_COMMENTS_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    connection.executescript(_SCHEMA)
+                    self._migrate_json(connection)
+                    self._initialized = True
+        return connection
+
+    def _migrate_json(self, connection: sqlite3.Connection):
+        """
+        Imports `legacy_path` ({quarter: [{LOB, UWY, Comment}]}) once. A
+        missing or invalid file is not marked as migrated, so it is imported
+        once it is present and readable.
+        """
+        done = connection.execute(
+            "SELECT 1 FROM meta WHERE key = 'json_migrated'"
+        ).fetchone()
+        if done:
+            return
+        try:
+            with open(self.legacy_path, "r") as f:
+                legacy = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            warning(f"Comments file '{self.legacy_path}' contains invalid JSON, not migrated")
+            return
+
+        now = _now()
+        rows = [
+            (quarter, str(entry["LOB"]), int(entry["UWY"]), entry.get("Comment") or "", now)
+            for quarter, entries in legacy.items()
+            for entry in entries
+        ]
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR IGNORE INTO comments (quarter, lob, uwy, comment, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (now,),
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        if rows:
+            info(f"Migrated {len(rows)} comment(s) from {self.legacy_path} to {self.path}")
+
+    # ------------------------------------------------------------------ reads
+    def quarter(self, quarter: str) -> dict:
+        """Returns the comments of `quarter` as {(LOB, UWY): comment}."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT lob, uwy, comment FROM comments WHERE quarter = ?", (quarter,)
+            ).fetchall()
+        return {(lob, uwy): comment for lob, uwy, comment in rows}
+
+    def frame(self, quarter: str) -> pd.DataFrame:
+        """Returns the comments of `quarter` as a LOB / UWY / Comment table."""
+        comments = self.quarter(quarter)
+        return pd.DataFrame(
+            [(lob, uwy, comment) for (lob, uwy), comment in comments.items()],
+            columns=["LOB", "UWY", "Comment"],
+        ).astype({"UWY": "int64"})
+
+    def history(self, quarter: str, lob: str = None, uwy: int = None) -> pd.DataFrame:
+        """Returns the edits of `quarter` (optionally of one LOB/UWY), oldest first."""
+        query = (
+            "SELECT lob AS LOB, uwy AS UWY, old_comment, new_comment, author, changed_at "
+            "FROM comment_history WHERE quarter = ?"
+        )
+        params = [quarter]
+        if lob is not None:
+            query += " AND lob = ?"
+            params.append(lob)
+        if uwy is not None:
+            query += " AND uwy = ?"
+            params.append(int(uwy))
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(query + " ORDER BY id", connection, params=params)
+
+    # ----------------------------------------------------------------- writes
+    def upsert(self, quarter: str, comments: dict, author: str = None) -> int:
+        """
+        Saves {(LOB, UWY): comment} for `quarter`, writing only the comments
+        that differ from the stored ones. Returns the number of comments changed.
+        """
+        changed = 0
+        now = _now()
+        with closing(self._connect()) as connection:
+            # takes the write lock before reading, so the comparison cannot go stale
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for (lob, uwy), comment in comments.items():
+                    lob, uwy, comment = str(lob), int(uwy), comment or ""
+                    row = connection.execute(
+                        "SELECT comment FROM comments WHERE quarter = ? AND lob = ? AND uwy = ?",
+                        (quarter, lob, uwy),
+                    ).fetchone()
+                    old = row[0] if row else None
+                    if old == comment or (old is None and comment == ""):
+                        continue
+                    connection.execute(
+                        "INSERT INTO comments (quarter, lob, uwy, comment, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (quarter, lob, uwy) DO UPDATE SET "
+                        "comment = excluded.comment, updated_at = excluded.updated_at",
+                        (quarter, lob, uwy, comment, now),
+                    )
+                    connection.execute(
+                        "INSERT INTO comment_history "
+                        "(quarter, lob, uwy, old_comment, new_comment, author, changed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (quarter, lob, uwy, old, comment, author, now),
+                    )
+                    changed += 1
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        debug("Saved %d changed comment(s) for %s", changed, quarter)
+        return changed
+
+
+comment_store = CommentStore()
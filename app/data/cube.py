@@ -0,0 +1,46 @@
+import pandas as pd
+from data.time_index import time_slice
+from shared.profiling import profiled
+
+CUBE_DIMENSIONS = ["Final LOB", "LOB", "UWY", "Measure", "Month"]
+
+
+@profiled("build_cube")
+def build_cube(dataset) -> pd.DataFrame:
+    """Sums `value` by Final LOB, LOB, UWY, Measure and cutoff month."""
+    df = dataset.view()
+    df["Month"] = df["CutOffDate"].dt.to_period("M")
+    cube = df.groupby(CUBE_DIMENSIONS, observed=True, as_index=False)["value"].sum()
+    # sorted by month so month ranges are binary searches (see `slice_cube`)
+    return cube.sort_values("Month", kind="stable", ignore_index=True)
+
+
+def get_cube(dataset) -> pd.DataFrame:
+    """Returns the aggregation cube of `dataset`, computed once per dataset load."""
+    return dataset.derived("cube", build_cube)
+
+
+@profiled("slice_cube")
+def slice_cube(
+    cube: pd.DataFrame,
+    measures=None,
+    final_lobs=None,
+    uwys=None,
+    start_month=None,
+    end_month=None,
+) -> pd.DataFrame:
+    """
+    Filters the cube on its dimensions; `None` keeps every value.
+
+    Months are inclusive bounds and accept anything `pd.Period(..., "M")`
+    understands (e.g. "2025-07" or a cutoff date string).
+    """
+    cube = time_slice(cube, "Month", start=start_month, end=end_month)
+    mask = pd.Series(True, index=cube.index)
+    if measures is not None:
+        mask &= cube["Measure"].isin(measures)
+    if final_lobs is not None:
+        mask &= cube["Final LOB"].isin(final_lobs)
+    if uwys is not None:
+        mask &= cube["UWY"].isin(uwys)
+    return cube[mask]
@@ -0,0 +1,156 @@
+import os
+import re
+import threading
+import uuid
+import weakref
+
+import pandas as pd
+from data.parquet_cache import read_excel_cached
+from data.schema import apply_schema, memory_report, log_memory_report
+from data.time_index import sort_by_time, time_slice
+from shared.colored_logging import info, debug
+from shared.profiling import profiled
+
+_PERIOD_PATTERN = re.compile(r"^(?P<series>.+?)_(?P<period>\d{6})")
+
+
+def parse_source_name(path: str):
+    """Splits a `data_YYYYMM*.xlsx` file name into its (series, period) parts."""
+    match = _PERIOD_PATTERN.match(os.path.basename(path))
+    if match is None:
+        return os.path.basename(path), ""
+    return match.group("series"), match.group("period")
+
+
+@profiled("load_transactions")
+def load_transactions(path: str) -> pd.DataFrame:
+    """Loads the "Final" transactions sheet of `path` with the typed schema applied."""
+    raw = read_excel_cached(path, sheet_name="Final")
+    typed = apply_schema(raw)
+    log_memory_report(memory_report(raw, typed), path)
+    return typed
+
+
+class Dataset:
+    """An immutable transactions dataset, loaded once and shared by all sessions."""
+
+    def __init__(self, source: str, frame: pd.DataFrame):
+        self.source = source
+        # unique per load, so caches keyed on it never outlive this data
+        self.fingerprint = uuid.uuid4().hex
+        self.series, self.period = parse_source_name(source)
+        # kept sorted by cutoff date so period filters are binary searches
+        self._frame = sort_by_time(frame) if "CutOffDate" in frame else frame
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._frame.memory_usage(deep=True).sum())
+
+    def view(self) -> pd.DataFrame:
+        """
+        Returns a read-only view of the transactions (writes stay local to the view).
+
+        The view is a shallow copy when copy-on-write is enabled (as the app
+        and report pack entry points do), and a full copy otherwise.
+        """
+        return self._frame.copy(deep=not pd.get_option("mode.copy_on_write"))
+
+    @profiled("Dataset.between")
+    def between(self, start=None, end=None) -> pd.DataFrame:
+        """Returns a read-only view of the transactions with start <= CutOffDate <= end."""
+        return time_slice(self.view(), "CutOffDate", start=start, end=end)
+
+    @profiled("Dataset.take")
+    def take(self, positions) -> pd.DataFrame:
+        """Returns a read-only view of the transactions at the given row positions."""
+        return self._frame.take(positions)
+
+    def derived(self, name: str, builder):
+        """Returns the artifact `name` computed once from this dataset by `builder(dataset)`."""
+        if name in self._derived:
+            return self._derived[name]
+        # reentrant: builders may depend on other artifacts of the same dataset
+        with self._lock:
+            if name not in self._derived:
+                debug("Building derived artifact '%s' for %s", name, self.source)
+                self._derived[name] = builder(self)
+            return self._derived[name]
+
+    def __repr__(self):
+        return f"Dataset(source={self.source!r}, rows={len(self._frame)})"
+
+
+class DatasetRegistry:
+    """
+    Process-wide registry of shared datasets.
+
+    Each input file is loaded at most once per process. The most recent
+    period of every series (e.g. `data_202510` replacing `data_202509`) is
+    held strongly; replaced datasets are only referenced weakly, so they are
+    evicted as soon as the last session holding them lets go.
+    """
+
+    def __init__(self, loader=load_transactions):
+        self._loader = loader
+        self._current = {}
+        self._retired = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def _lookup(self, source: str):
+        for dataset in list(self._current.values()) + list(self._retired.values()):
+            if dataset.source == source:
+                return dataset
+        return None
+
+    def acquire(self, source: str, loader=None) -> Dataset:
+        """
+        Returns the shared dataset of `source`, loading it if no session has yet.
+
+        `loader(source)` overrides the registry loader, e.g. to build the
+        dataset from the history store rather than from a single workbook.
+        """
+        source = os.path.abspath(source)
+        loader = loader or self._loader
+        with self._lock:
+            dataset = self._lookup(source)
+            if dataset is not None:
+                return dataset
+            load_lock = self._load_locks.setdefault(source, threading.Lock())
+
+        # Loading happens outside the registry lock so other files stay available;
+        # the per-file lock makes concurrent sessions wait for a single load.
+        with load_lock:
+            with self._lock:
+                dataset = self._lookup(source)
+            if dataset is None:
+                info(f"Loading shared dataset from {source}")
+                dataset = Dataset(source, loader(source))
+                self._publish(dataset)
+        return dataset
+
+    def _publish(self, dataset: Dataset):
+        with self._lock:
+            self._load_locks.pop(dataset.source, None)
+            current = self._current.get(dataset.series)
+            if current is not None and current.period > dataset.period:
+                # an older file was requested explicitly: keep it only while used
+                self._retired[dataset.source] = dataset
+                return
+            if current is not None:
+                info(f"Retiring dataset {current.source}, replaced by {dataset.source}")
+                self._retired[current.source] = current
+            self._current[dataset.series] = dataset
+
+    def stats(self) -> dict:
+        """Returns the sources of the current and retired-but-still-referenced datasets."""
+        with self._lock:
+            return {
+                "current": [dataset.source for dataset in self._current.values()],
+                "retired": list(self._retired.keys()),
+            }
+
+
+registry = DatasetRegistry()
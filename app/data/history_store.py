@@ -0,0 +1,173 @@
+import contextlib
+import fcntl
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+from data.schema import apply_schema, TRANSACTION_KEY
+from shared.colored_logging import info, debug
+from shared.profiling import profiled
+
+HISTORY_DIR = os.path.join("history", "transactions")
+DATA_FILE_PATTERN = re.compile(r"^data_\d{6}.*\.xlsx$")
+_MANIFEST = "_ingested.json"
+_LOCK_FILE = ".ingest.lock"
+
+
+def discover_data_files(directory: str = "inputs") -> dict:
+    """Returns the `data_YYYYMM*.xlsx` workbooks of `directory`, by file name."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        file: os.path.join(directory, file)
+        for file in sorted(os.listdir(directory))
+        if DATA_FILE_PATTERN.match(file)
+    }
+
+
+def _row_keys(df: pd.DataFrame) -> pd.Series:
+    """Hashes the transaction key of every row (categories are hashed by value)."""
+    return pd.util.hash_pandas_object(df[TRANSACTION_KEY], index=False)
+
+
+class HistoryStore:
+    """
+    Transaction history stored as one Parquet partition per cutoff month.
+
+    Monthly workbooks are ingested once: their rows are upserted into the
+    partitions of the months they cover, replacing previously ingested rows
+    with the same transaction key. Ingestion holds a file lock in `root`, so
+    the server and `report_pack` can share a store.
+    """
+
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+        self._lock = threading.RLock()
+
+    # ----------------------------------------------------------------- layout
+    def _partition_path(self, month: pd.Period) -> str:
+        return os.path.join(self.root, f"month={month.strftime('%Y-%m')}", "part.parquet")
+
+    def months(self) -> list:
+        """Returns the cutoff months stored, in ascending order."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            pd.Period(entry.split("=", 1)[1], "M")
+            for entry in os.listdir(self.root)
+            if entry.startswith("month=")
+        )
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Holds the store against other threads and processes ingesting into it."""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, _LOCK_FILE), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.root, _MANIFEST), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"version": 0, "files": {}}
+
+    def _write_manifest(self, manifest: dict):
+        path = os.path.join(self.root, _MANIFEST)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, path)
+
+    def _read_partition(self, month: pd.Period):
+        path = self._partition_path(month)
+        return pd.read_parquet(path, engine="pyarrow") if os.path.exists(path) else None
+
+    def _write_partition(self, month: pd.Period, rows: pd.DataFrame):
+        path = self._partition_path(month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        rows.to_parquet(tmp, engine="pyarrow", index=False)
+        os.replace(tmp, path)
+
+    # -------------------------------------------------------------- ingestion
+    @staticmethod
+    def _file_signature(path: str) -> dict:
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_ingested(self, path: str) -> bool:
+        entry = self._read_manifest()["files"].get(os.path.abspath(path))
+        return entry is not None and entry["signature"] == self._file_signature(path)
+
+    def ingest_frame(self, new: pd.DataFrame) -> list:
+        """Upserts typed transactions into their month partitions; returns the months touched."""
+        new = apply_schema(new)
+        months = new["CutOffDate"].dt.to_period("M")
+        touched = []
+        for month, rows in new.groupby(months, sort=True):
+            existing = self._read_partition(month)
+            if existing is not None:
+                existing = apply_schema(existing)
+                replaced = _row_keys(existing).isin(_row_keys(rows))
+                debug("Partition %s: replacing %d rows", month, replaced.sum())
+                rows = pd.concat([existing[~replaced], rows], ignore_index=True)
+            self._write_partition(month, rows)
+            touched.append(month)
+        return touched
+
+    @profiled("HistoryStore.ingest")
+    def ingest_parsed(self, path: str, frame: pd.DataFrame, force: bool = False) -> list:
+        """
+        Ingests the already parsed "Final" sheet of `path` and records the
+        workbook, unless another caller ingested the same file meanwhile.
+        Workbooks are parsed by `ingest_inputs`.
+        """
+        with self._locked():
+            if not force and self.is_ingested(path):
+                debug("%s already ingested, skipping", path)
+                return []
+            info(f"Ingesting {path} into {self.root}")
+            touched = self.ingest_frame(frame)
+            self._record(path, touched)
+        return touched
+
+    def _record(self, path: str, touched: list):
+        manifest = self._read_manifest()
+        manifest["version"] += 1
+        manifest["files"][os.path.abspath(path)] = {
+            "signature": self._file_signature(path),
+            "months": [str(month) for month in touched],
+        }
+        self._write_manifest(manifest)
+
+    # ---------------------------------------------------------------- reading
+    @profiled("HistoryStore.load")
+    def load(self) -> pd.DataFrame:
+        """
+        Loads every partition. Period windows are sliced from the shared
+        dataset in memory (see `Dataset.between`), not re-read from disk.
+        """
+        months = self.months()
+        debug("Loading %d partition(s) from %s", len(months), self.root)
+        frames = [self._read_partition(month) for month in months]
+        if not frames:
+            return pd.DataFrame(columns=TRANSACTION_KEY + ["value"])
+        return apply_schema(pd.concat(frames, ignore_index=True))
+
+    def snapshot_source(self) -> str:
+        """Identifies the current content of the store, e.g. `.../history_202509-v3`."""
+        months = self.months()
+        latest = months[-1].strftime("%Y%m") if months else "000000"
+        version = self._read_manifest()["version"]
+        return os.path.join(self.root, f"history_{latest}-v{version}")
+
+
+history = HistoryStore()
@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+from data.history_store import history, discover_data_files
+from data.parquet_cache import read_excel_cached
+from data.schema import apply_schema, memory_report, log_memory_report
+from shared.colored_logging import info, debug, error
+from shared.profiling import profiled
+
+# `helper_functions` (the Finance Summary loader) lives at the repository root
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from helper_functions import load_input_tables  # noqa: E402
+
+# monthly workbooks and Excel lock files (`~$...`) are not Summary files
+SUMMARY_FILE_PATTERN = re.compile(r"^(?!data_|~\$).*summary.*\.xlsx$", re.IGNORECASE)
+
+# Finance Summary tables by workbook path: (file signature, {table name: DataFrame})
+_summaries = {}
+_summaries_lock = threading.Lock()
+# one ingestion at a time: a concurrent caller waits, then finds the files ingested
+_ingest_lock = threading.Lock()
+
+
+def discover_summary_files(directory: str = "inputs") -> dict:
+    """Returns the Finance Summary workbooks (`*summary*.xlsx`) of `directory`, by file name."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        file: os.path.join(directory, file)
+        for file in sorted(os.listdir(directory))
+        if SUMMARY_FILE_PATTERN.match(file)
+    }
+
+
+# ------------------------------------------------------------- worker side
+def _to_arrow(df: pd.DataFrame, preserve_index: bool = False) -> pa.Buffer:
+    """Serialises `df` as an Arrow IPC stream; the buffer crosses processes as raw bytes."""
+    table = pa.Table.from_pandas(df, preserve_index=preserve_index)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _from_arrow(buffer: pa.Buffer) -> pd.DataFrame:
+    return pa.ipc.open_stream(buffer).read_all().to_pandas()
+
+
+def _summary_from_arrow(buffer: pa.Buffer) -> pd.DataFrame:
+    """Restores a Summary table as `load_input_tables` returns it (object UWY index)."""
+    table = _from_arrow(buffer)
+    table.index = table.index.astype(object)
+    return table
+
+
+def _parse_transactions(path: str) -> tuple:
+    """
+    Reads and types the "Final" sheet of a monthly workbook; returns it with
+    the memory report of the schema.
+    """
+    raw = read_excel_cached(path, sheet_name="Final")
+    typed = apply_schema(raw)
+    return _to_arrow(typed), memory_report(raw, typed)
+
+
+def _parse_summary(path: str) -> dict:
+    """Reads the Summary tables of a Finance allocation workbook."""
+    return {
+        name: _to_arrow(table.rename(columns=str), preserve_index=True)
+        for name, table in load_input_tables(path).items()
+    }
+
+
+# ------------------------------------------------------------- parent side
+def _signature(path: str) -> tuple:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _result(path: str, compute):
+    """Returns `compute()`, or None after logging why `path` could not be parsed."""
+    try:
+        return compute()
+    except Exception as e:
+        error(f"Could not parse {path}: {e}")
+        return None
+
+
+def _run(tasks: list, workers: int = None) -> list:
+    """
+    Runs (function, path) tasks in a process pool; results in task order.
+    A task that fails yields None, so one unreadable workbook does not
+    prevent the others from being ingested.
+    """
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [_result(path, lambda: fn(path)) for fn, path in tasks]
+    debug("Parsing %d workbook(s) with %d process(es)", len(tasks), workers)
+    # spawned, not forked: ingestion runs beside the warm-up, watcher and
+    # logging threads, whose locks a forked child could inherit held
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [(path, pool.submit(fn, path)) for fn, path in tasks]
+        return [_result(path, future.result) for path, future in futures]
+
+
+@profiled("ingest_inputs")
+def ingest_inputs(directory: str = "inputs", store=history, workers: int = None) -> list:
+    """
+    Parses the new monthly workbooks and Finance Summary files of `directory`
+    in parallel and merges them: transactions into the history `store`,
+    Summary tables into the in-process summary cache.
+
+    Workers return Arrow IPC buffers, not pickled DataFrames. Monthly
+    workbooks are upserted in file name order, so later months still win.
+    Workbooks that fail to parse are logged and skipped (and retried on the
+    next call). Returns the months touched in the store.
+    """
+    with _ingest_lock:
+        data_files = [
+            path
+            for path in discover_data_files(directory).values()
+            if not store.is_ingested(path)
+        ]
+        with _summaries_lock:
+            summary_files = [
+                path
+                for path in discover_summary_files(directory).values()
+                if _summaries.get(path, (None,))[0] != _signature(path)
+            ]
+        if not data_files and not summary_files:
+            return []
+
+        info(f"Parsing {len(data_files)} monthly and {len(summary_files)} Summary workbook(s)")
+        tasks = [(_parse_transactions, path) for path in data_files]
+        tasks += [(_parse_summary, path) for path in summary_files]
+        results = _run(tasks, workers)
+
+        touched = set()
+        for path, parsed in zip(data_files, results):
+            if parsed is not None:
+                buffer, report = parsed
+                log_memory_report(report, path)
+                # re-checked under the store lock, which other ingestion paths share
+                touched.update(store.ingest_parsed(path, _from_arrow(buffer)))
+        with _summaries_lock:
+            for path, buffers in zip(summary_files, results[len(data_files) :]):
+                if buffers is not None:
+                    _summaries[path] = (
+                        _signature(path),
+                        {name: _summary_from_arrow(buffer) for name, buffer in buffers.items()},
+                    )
+        return sorted(touched)
+
+
+def get_summary_tables() -> dict:
+    """Returns the ingested Finance Summary tables as {workbook path: {table name: DataFrame}}."""
+    with _summaries_lock:
+        return {path: tables for path, (_, tables) in _summaries.items()}
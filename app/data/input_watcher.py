@@ -0,0 +1,76 @@
+import os
+import threading
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from data.history_store import DATA_FILE_PATTERN
+from data.ingestion import SUMMARY_FILE_PATTERN
+from shared.colored_logging import info, warning, debug
+
+# quiet period after the last event before a rebuild, so a workbook still
+# being copied into the directory is read once, complete
+DEBOUNCE_SECONDS = 2.0
+
+_observer = None
+_observer_lock = threading.Lock()
+
+
+def is_input_file(path: str) -> bool:
+    """True for monthly (`data_YYYYMM*.xlsx`) and Finance Summary workbooks."""
+    name = os.path.basename(path)
+    return bool(DATA_FILE_PATTERN.match(name) or SUMMARY_FILE_PATTERN.match(name))
+
+
+class InputsEventHandler(FileSystemEventHandler):
+    """Calls `on_change()` once the input workbooks stopped changing for `debounce` seconds."""
+
+    def __init__(self, on_change, debounce: float = DEBOUNCE_SECONDS):
+        self.on_change = on_change
+        self.debounce = debounce
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ("created", "modified", "moved", "closed"):
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if not is_input_file(path):
+            return
+        debug("Input workbook %s: %s", event.event_type, path)
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        info("Input workbooks changed, rebuilding the dataset in the background")
+        self.on_change()
+
+
+def start_input_watcher(directory: str, on_change, debounce: float = DEBOUNCE_SECONDS):
+    """Watches `directory` for new or changed workbooks, once per process."""
+    global _observer
+    with _observer_lock:
+        if _observer is not None:
+            return _observer
+        if not os.path.isdir(directory):
+            warning(f"Not watching {directory}: no such directory")
+            return None
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(InputsEventHandler(on_change, debounce), directory, recursive=False)
+        observer.start()
+        info(f"Watching {directory} for new workbooks")
+        _observer = observer
+        return observer
+
+
+def stop_input_watcher():
+    global _observer
+    with _observer_lock:
+        if _observer is not None:
+            _observer.stop()
+            _observer.join()
+            _observer = None
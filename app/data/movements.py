@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from shared.profiling import profiled
+
+
+def _to_periods(times: pd.Series, freq: str) -> pd.Series:
+    """Converts a datetime64 or Period column to periods of `freq` (M = months)."""
+    if isinstance(times.dtype, pd.PeriodDtype):
+        return times.dt.asfreq(freq) if times.dtype.freq.name != freq else times
+    return times.dt.to_period(freq)
+
+
+def _range_label(start: pd.Period, end: pd.Period) -> str:
+    return str(start) if start == end else f"{start}..{end}"
+
+
+def _empty_movements(data, by, measures, labels, total_name) -> pd.DataFrame:
+    """The movement table of no rows: the `by` columns and every value column."""
+    suffixes = ["Total"] + labels
+    values = [f"{m}_{suffix}" for suffix in suffixes for m in measures]
+    values += [f"{total_name}_{suffix}" for suffix in suffixes]
+    return data[by].iloc[:0].assign(**{column: pd.Series(dtype=float) for column in values})
+
+
+@profiled("compute_movements")
+def compute_movements(
+    data: pd.DataFrame,
+    by=("Final LOB", "UWY"),
+    freq: str = "M",
+    n_periods: int = 1,
+    measures=None,
+    as_of=None,
+    start=None,
+    end=None,
+    time_column: str = "Month",
+    measure_column: str = "Measure",
+    value_column: str = "value",
+    total_name: str = "Incurred",
+):
+    """
+    Computes cumulative-to-date values and period movements in one grouped pass.
+
+    Every row is bucketed by how many periods it lies before the last one,
+    then a single groupby over `by` x measure x bucket yields both the
+    cumulative totals (all buckets) and the movement of each of the last
+    `n_periods` periods.
+
+    Periods are months ("M"), quarters ("Q") or years ("Y") ending with the
+    period of `as_of` (default: the latest period in `data`). Passing
+    `start`/`end` instead uses a custom month range, and earlier periods are
+    ranges of the same length immediately before it. Rows after the last
+    period are ignored.
+
+    Args:
+        data (pd.DataFrame): Transactions or cube rows with `time_column`
+            (datetime64 or Period), `measure_column` and `value_column`.
+        by (sequence): Row keys of the result, e.g. ("Final LOB", "UWY").
+        n_periods (int): Number of movement periods, latest first.
+        measures (list): Measures reported, in order (default: those in
+            `data`). Fixes the columns even when `data` has no rows.
+        total_name (str): Prefix of the all-measures columns.
+
+    Returns:
+        tuple: The movement table (one row per `by` key, with columns
+        `<measure>_Total` and `<measure>_<period label>`, then the same for
+        `total_name`) and the list of period labels, latest first.
+    """
+    by = list(by)
+    if start is not None or end is not None:
+        periods = _to_periods(data[time_column], "M")
+        end = pd.Period(end, "M") if end is not None else periods.max()
+        start = pd.Period(start, "M") if start is not None else periods.min()
+        if pd.isna(start) or pd.isna(end):  # no rows to take the range from
+            return _empty_movements(data, by, measures or [], [], total_name), []
+        length = (end - start).n + 1
+        offsets = (end.ordinal - periods.array.asi8) // length
+        labels = [
+            _range_label(start - i * length, end - i * length) for i in range(n_periods)
+        ]
+    else:
+        periods = _to_periods(data[time_column], freq)
+        last = pd.Period(as_of, freq) if as_of is not None else periods.max()
+        if pd.isna(last):  # no rows to take the last period from
+            return _empty_movements(data, by, measures or [], [], total_name), []
+        offsets = last.ordinal - periods.array.asi8
+        labels = [str(last - i) for i in range(n_periods)]
+
+    # bucket k is the k-th period before the last one; older rows share bucket n
+    in_scope = (offsets >= 0) & periods.notna().to_numpy()
+    if not in_scope.any():
+        if measures is None:
+            measures = data[measure_column].unique().tolist()
+        return _empty_movements(data, by, measures, labels, total_name), labels
+    grouped = (
+        data.loc[in_scope, by + [measure_column, value_column]]
+        .assign(_bucket=np.minimum(offsets[in_scope], n_periods))
+        .groupby(by + [measure_column, "_bucket"], observed=True)[value_column]
+        .sum()
+    )
+    totals = (
+        grouped.groupby(level=by + [measure_column], observed=True)
+        .sum()
+        .unstack(measure_column, fill_value=0)
+    )
+    moves = grouped.unstack([measure_column, "_bucket"], fill_value=0)
+
+    if measures is None:
+        measures = totals.columns.tolist()
+    totals = totals.reindex(columns=measures, fill_value=0)
+    columns = {f"{m}_Total": totals[m] for m in measures}
+    for i, label in enumerate(labels):
+        for m in measures:
+            columns[f"{m}_{label}"] = moves[(m, i)] if (m, i) in moves.columns else 0.0
+    table = pd.DataFrame(columns, index=totals.index)
+    for suffix in ["Total"] + labels:
+        table[f"{total_name}_{suffix}"] = table[[f"{m}_{suffix}" for m in measures]].sum(
+            axis=1
+        )
+    return table.reset_index(), labels
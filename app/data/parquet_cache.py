@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+from shared.colored_logging import info, debug
+from shared.profiling import profiled
+
+CACHE_DIR = os.path.join(".cache", "workbooks")
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_digest(path: str) -> str:
+    """Returns the sha256 of the file content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(path: str, sheet_name: str) -> dict:
+    """Builds the cache key of a workbook sheet: path, size, mtime and content hash."""
+    stat = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "sheet_name": sheet_name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _file_digest(path),
+    }
+
+
+def _cache_paths(key: dict, cache_dir: str):
+    """Returns the (parquet, manifest) paths of a cache entry."""
+    stem = os.path.splitext(os.path.basename(key["path"]))[0]
+    path_id = hashlib.sha256(
+        f"{key['path']}::{key['sheet_name']}".encode("utf-8")
+    ).hexdigest()[:16]
+    base = os.path.join(cache_dir, f"{stem}-{key['sheet_name']}-{path_id}")
+    return f"{base}.parquet", f"{base}.json"
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts mixed-type object columns (e.g. numeric and text references) to strings."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    # parquet requires string column names
+    df.columns = [str(col) for col in df.columns]
+    return df
+
+
+def _write_atomic(df: pd.DataFrame, key: dict, parquet_path: str, manifest_path: str):
+    """Writes the parquet copy and its manifest so readers never see a partial entry."""
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp_parquet = f"{parquet_path}.{os.getpid()}.tmp"
+    tmp_manifest = f"{manifest_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_parquet, engine="pyarrow", index=False)
+    with open(tmp_manifest, "w") as f:
+        json.dump(key, f, indent=2)
+    os.replace(tmp_parquet, parquet_path)
+    os.replace(tmp_manifest, manifest_path)
+
+
+def _read_manifest(manifest_path: str):
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+@profiled("read_excel_cached")
+def read_excel_cached(
+    path: str, sheet_name: str = "Final", cache_dir: str = CACHE_DIR
+) -> pd.DataFrame:
+    """
+    Reads a workbook sheet through a columnar (Parquet) on-disk cache.
+
+    The first read parses the sheet with openpyxl and stores a Parquet copy
+    next to a manifest holding the cache key. Later reads load the Parquet
+    copy as long as the workbook path, size, mtime and content hash still
+    match the manifest; otherwise the entry is stale and is rebuilt.
+
+    Args:
+        path (str): Path to the Excel workbook.
+        sheet_name (str): Name of the sheet to read.
+        cache_dir (str): Directory holding the cached Parquet copies.
+
+    Returns:
+        pd.DataFrame: The sheet content.
+    """
+    key = cache_key(path, sheet_name)
+    parquet_path, manifest_path = _cache_paths(key, cache_dir)
+
+    if _read_manifest(manifest_path) == key and os.path.exists(parquet_path):
+        debug("Loading '%s' of %s from cache %s", sheet_name, path, parquet_path)
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+
+    info(f"Building columnar cache for '{sheet_name}' of {path}")
+    df = _arrow_safe(pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl"))
+    _write_atomic(df, key, parquet_path, manifest_path)
+    return df
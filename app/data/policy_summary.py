@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import pandas as pd
+from data.reference_index import get_reference_index
+from data.reference_search import get_reference_search
+from shared.utils import create_pivot_table
+
+
+def build_policy_summary(dataset) -> pd.DataFrame:
+    """Sums `value` by PolicyReference x Measure and counts the claims of each policy."""
+    df = dataset.view()
+    summary = (
+        df.groupby(["PolicyReference", "Measure"], observed=True)["value"]
+        .sum()
+        .unstack("Measure", fill_value=0)
+    )
+    summary.columns = summary.columns.astype(str)
+    summary["Claims"] = (
+        df.groupby("PolicyReference", observed=True)["ClaimReference"].nunique()
+    )
+    summary.index = summary.index.astype(str)
+    return summary
+
+
+def get_policy_summary(dataset) -> pd.DataFrame:
+    """Returns the policy summary of `dataset`, computed once per dataset load."""
+    return dataset.derived("policy_summary", build_policy_summary)
+
+
+def _sort_order(dataset, column) -> np.ndarray:
+    """Returns the (cached) ascending order of the policy summary by `column`."""
+
+    def build(d):
+        summary = get_policy_summary(d)
+        values = summary.index if column is None else summary[column]
+        return np.argsort(np.asarray(values), kind="stable")
+
+    return dataset.derived(f"policy_summary_order:{column}", build)
+
+
+def policy_page(
+    dataset,
+    page: int = 1,
+    page_size: int = 50,
+    sort_by=None,
+    ascending: bool = True,
+    search: str = "",
+):
+    """
+    Returns one page of the policy summary and the number of pages.
+
+    Policies are optionally filtered on a reference substring and sorted by
+    a summary column (`None` sorts by policy reference). Sort orders are
+    computed once per dataset, so a page costs O(page_size) after that.
+    """
+    summary = get_policy_summary(dataset)
+    order = _sort_order(dataset, sort_by)
+    if not ascending:
+        order = order[::-1]
+    if search:
+        matches = get_reference_search(dataset, "PolicyReference").matches(search)
+        order = order[np.isin(order, summary.index.get_indexer(matches))]
+
+    n_pages = max(1, math.ceil(len(order) / page_size))
+    page = min(max(page, 1), n_pages)
+    positions = order[(page - 1) * page_size : page * page_size]
+    return summary.iloc[positions], n_pages
+
+
+def policy_detail(dataset, policy) -> dict:
+    """Drill-down of one policy: its claims and its movements by cutoff date."""
+    index = get_reference_index(dataset)
+    rows = dataset.take(index.policy_rows([policy]))
+    return {
+        "claims": create_pivot_table(
+            rows, index=["ClaimReference"], columns="Measure", values="value"
+        ),
+        "movements": create_pivot_table(
+            rows, index=["CutOffDate"], columns="Measure", values="value"
+        ),
+    }
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from shared.profiling import profiled
+
+_SLICE_LOOKUP_LIMIT = 1000
+
+
+class _PositionIndex:
+    """Maps each value of a column to the (ascending) positions of its rows."""
+
+    def __init__(self, column: pd.Series):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes, keys = column.cat.codes.to_numpy(), column.cat.categories
+        else:
+            codes, keys = pd.factorize(column)
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        # a stable sort groups the rows of every key while keeping their order
+        self._order = np.argsort(codes, kind="stable")[np.count_nonzero(codes < 0) :]
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.codes = codes
+        self.categories = pd.Index(keys)
+        self.keys = self.categories[counts > 0]
+
+    def lookup(self, values) -> np.ndarray:
+        """Returns the sorted row positions of `values` (unknown values are ignored)."""
+        codes = self.categories.get_indexer(pd.Index(values).unique())
+        codes = codes[codes >= 0]
+        if len(codes) == 0:
+            return np.empty(0, dtype=np.intp)
+        if len(codes) > _SLICE_LOOKUP_LIMIT:
+            # selecting most keys: a vectorized pass beats gathering many slices
+            selected = np.zeros(len(self.categories) + 1, dtype=bool)
+            selected[codes] = True
+            return np.flatnonzero(selected[self.codes])
+        positions = np.concatenate(
+            [self._order[self._offsets[c] : self._offsets[c + 1]] for c in codes]
+        )
+        return np.sort(positions)
+
+
+class ReferenceIndex:
+    """
+    Row positions of every claim and policy reference of a dataset.
+
+    Looking up k references costs O(rows of those references) instead of a
+    full `isin` scan, and every policy is linked to the claims made on it.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self._claims = _PositionIndex(frame["ClaimReference"])
+        self._policies = _PositionIndex(frame["PolicyReference"])
+
+        links = pd.DataFrame(
+            {"policy": self._policies.codes, "claim": self._claims.codes}
+        )
+        links = links[(links["policy"] >= 0) & (links["claim"] >= 0)].drop_duplicates()
+        self._policy_claims = links.groupby("policy")["claim"].unique()
+
+    @property
+    def claims(self) -> pd.Index:
+        """Claim references present in the dataset."""
+        return self._claims.keys
+
+    @property
+    def policies(self) -> pd.Index:
+        """Policy references present in the dataset."""
+        return self._policies.keys
+
+    @profiled("ReferenceIndex.claim_rows")
+    def claim_rows(self, claims) -> np.ndarray:
+        """Returns the row positions of the given claims, in dataset order."""
+        return self._claims.lookup(claims)
+
+    def policy_rows(self, policies) -> np.ndarray:
+        """Returns the row positions of the given policies, in dataset order."""
+        return self._policies.lookup(policies)
+
+    def claims_of_policy(self, policy) -> list:
+        """Returns the claim references made on `policy`."""
+        code = self._policies.categories.get_indexer([policy])[0]
+        if code not in self._policy_claims.index:
+            return []
+        return self._claims.categories[self._policy_claims[code]].tolist()
+
+
+def get_reference_index(dataset) -> ReferenceIndex:
+    """Returns the reference index of `dataset`, built once per dataset load."""
+    return dataset.derived("reference_index", lambda d: ReferenceIndex(d.view()))
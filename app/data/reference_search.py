@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+_NO_IDS = np.empty(0, dtype=np.int32)
+# bits per character in a packed n-gram code (covers every Unicode code point)
+_CHAR_BITS = 21
+
+
+def _gram_code(gram: str) -> int:
+    code = 0
+    for char in gram:
+        code = (code << _CHAR_BITS) | ord(char)
+    return code
+
+
+class _GramPostings:
+    """
+    The references holding each k-gram, with the first position of the gram
+    in each, stored as flat arrays grouped by gram (sorted gram codes).
+    """
+
+    def __init__(self, chars: np.ndarray, lengths: np.ndarray, k: int):
+        n_refs, width = chars.shape
+        n_starts = max(width - k + 1, 0)
+        codes = np.zeros((n_refs, n_starts), dtype=np.int64)
+        for c in range(k):
+            codes = (codes << _CHAR_BITS) | chars[:, c : c + n_starts]
+        ids, starts = np.nonzero(np.arange(n_starts) + k <= lengths[:, None])
+        grams = codes[ids, starts]
+
+        # keep the first occurrence of each gram in each reference
+        order = np.lexsort((starts, ids, grams))
+        grams, ids, starts = grams[order], ids[order], starts[order]
+        first = np.ones(len(grams), dtype=bool)
+        first[1:] = (grams[1:] != grams[:-1]) | (ids[1:] != ids[:-1])
+
+        self.grams, self._offsets = np.unique(grams[first], return_index=True)
+        self._offsets = np.append(self._offsets, np.count_nonzero(first))
+        self._ids = ids[first].astype(np.int32)
+        self._positions = starts[first].astype(np.int32)
+
+    def lookup(self, gram: str) -> tuple:
+        """Returns the (ascending) ids of the references holding `gram` and its positions."""
+        i = np.searchsorted(self.grams, _gram_code(gram))
+        if i == len(self.grams) or self.grams[i] != _gram_code(gram):
+            return _NO_IDS, _NO_IDS
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._ids[start:end], self._positions[start:end]
+
+
+class ReferenceSearch:
+    """
+    Case-insensitive substring search over a set of references.
+
+    Every reference is indexed by its character 1- to n-grams. A query of at
+    most n characters is answered by its own posting list; a longer one only
+    checks the references holding its rarest n-gram for the literal substring.
+    Queries are plain text, so characters such as `(` have no special meaning.
+    """
+
+    def __init__(self, references, n: int = 3):
+        self.n = n
+        self._references = np.array(sorted({str(r) for r in references}), dtype=object)
+        self._upper = np.array([r.upper() for r in self._references], dtype=str)
+        self._lengths = np.char.str_len(self._upper).astype(np.int32)
+
+        # one code point per cell; shorter references are padded with zeros
+        width = max(self._upper.dtype.itemsize // 4, 1)
+        chars = self._upper.view(np.uint32).reshape(len(self._upper), width).astype(np.int64)
+        self._postings = {k: _GramPostings(chars, self._lengths, k) for k in range(1, n + 1)}
+
+    def __len__(self):
+        return len(self._references)
+
+    def _match_ids(self, query: str) -> tuple:
+        """Returns the ascending ids of the references containing `query` and its positions."""
+        if len(query) <= self.n:
+            return self._postings[len(query)].lookup(query)
+        # the rarest n-gram bounds the candidates; the substring check does the rest
+        ids, _ = min(
+            (
+                self._postings[self.n].lookup(query[j : j + self.n])
+                for j in range(len(query) - self.n + 1)
+            ),
+            key=lambda posting: len(posting[0]),
+        )
+        positions = np.char.find(self._upper[ids], query)
+        found = positions >= 0
+        return ids[found], positions[found]
+
+    def matches(self, query: str) -> np.ndarray:
+        """Returns every reference containing `query`, in alphabetical order."""
+        query = query.strip().upper()
+        if not query:
+            return self._references[:0]
+        ids, _ = self._match_ids(query)
+        return self._references[ids]
+
+    def search(self, query: str, limit=None) -> list:
+        """
+        Returns the references containing `query`, best matches first.
+
+        Exact matches rank first, then prefixes, then earlier and shorter
+        matches, then alphabetical order. `limit` caps the number of
+        references returned; only those are sorted.
+        """
+        query = query.strip().upper()
+        if not query:
+            return []
+        ids, positions = self._match_ids(query)
+        lengths = self._lengths[ids]
+        inexact = (positions != 0) | (lengths != len(query))
+
+        # one int64 rank per match: (inexact, position, length, id)
+        width = int(self._lengths.max(initial=0)) + 1
+        rank = ((inexact * width + positions) * width + lengths).astype(np.int64) * len(
+            self._references
+        ) + ids
+        if limit is not None and limit < len(rank):
+            rank = rank[np.argpartition(rank, limit - 1)[:limit]] if limit > 0 else rank[:0]
+        rank.sort()
+        return self._references[rank % len(self._references)].tolist()
+
+
+def get_reference_search(dataset, column: str = "ClaimReference") -> ReferenceSearch:
+    """Returns the search structure over the `column` references of `dataset`."""
+
+    def build(d):
+        values = d.view()[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.remove_unused_categories().cat.categories
+        return ReferenceSearch(pd.Index(values).dropna())
+
+    return dataset.derived(f"reference_search:{column}", build)
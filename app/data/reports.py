@@ -0,0 +1,96 @@
+import pandas as pd
+from data.cube import slice_cube
+from data.movements import compute_movements
+from shared.constants import MEASURES
+from shared.utils import create_pivot_table
+
+# claim measures reported as movements (paid and outstanding)
+MOVEMENT_MEASURES = ["GClmO", "GClmP"]
+
+
+def movement_table(cube: pd.DataFrame, freq: str = "Q", n_periods: int = 1, as_of=None):
+    """
+    Totals to date and movements of the last `n_periods` by Final LOB and UWY.
+
+    `as_of` is the last reported period; pass the one of the full data when
+    `cube` is filtered, so the periods do not depend on the selection.
+    """
+    return compute_movements(
+        slice_cube(cube, measures=MOVEMENT_MEASURES),
+        by=["Final LOB", "UWY"],
+        freq=freq,
+        n_periods=n_periods,
+        measures=MOVEMENT_MEASURES,
+        as_of=as_of,
+    )
+
+
+def period_results(cube: pd.DataFrame, start_month=None) -> pd.DataFrame:
+    """Sums every measure from `start_month` onwards, by UWY x (Final LOB, Measure)."""
+    return create_pivot_table(
+        slice_cube(cube, measures=MEASURES, start_month=start_month),
+        index=["UWY"],
+        columns=["Final LOB", "Measure"],
+        values="value",
+        fill_value=0,
+        aggfunc="sum",
+    )
+
+
+def lob_uwy_summary(cube: pd.DataFrame) -> pd.DataFrame:
+    """Sums the movement measures by (Final LOB, UWY) x Measure."""
+    return create_pivot_table(
+        cube,
+        index=["Final LOB", "UWY"],
+        columns="Measure",
+        values="value",
+        fill_value=0,
+        aggfunc="sum",
+    )
+
+
+def monthly_movements(cube: pd.DataFrame) -> pd.DataFrame:
+    """Sums values by (Final LOB, UWY) x cutoff month, with months as "YYYY-MM" columns."""
+    return create_pivot_table(
+        cube,
+        index=["Final LOB", "UWY"],
+        columns="Month",
+        values="value",
+    ).rename(columns=str)
+
+
+def _flat(table: pd.DataFrame) -> pd.DataFrame:
+    """Moves the index to columns and joins multi-level column names with "_"."""
+    table = table.reset_index() if table.index.name or table.index.nlevels > 1 else table
+    if isinstance(table.columns, pd.MultiIndex):
+        table.columns = [
+            "_".join(str(level) for level in col if str(level)) for col in table.columns
+        ]
+    else:
+        table.columns = [str(col) for col in table.columns]
+    return table
+
+
+def lob_report(
+    cube: pd.DataFrame, final_lob: str, freq: str = "Q", n_periods: int = 1, as_of=None
+) -> dict:
+    """
+    Builds the report tables of one Final LOB from the aggregation cube.
+
+    Returns {table name: flat DataFrame}: the movements of the last
+    `n_periods` months or quarters (`freq`) up to `as_of`, the results of
+    the reported period, the UWY summary and the monthly movements. Pass
+    the `as_of` of the full cube so every LOB reports the same period.
+    """
+    as_of = pd.Period(as_of if as_of is not None else cube["Month"].max(), freq)
+    lob_cube = slice_cube(cube, final_lobs=[final_lob], end_month=as_of.asfreq("M", how="end"))
+    movements, _ = movement_table(lob_cube, freq=freq, n_periods=n_periods, as_of=as_of)
+    claims = slice_cube(lob_cube, measures=MOVEMENT_MEASURES)
+    return {
+        "movements": _flat(movements),
+        "period_results": _flat(
+            period_results(lob_cube, start_month=as_of.asfreq("M", how="start"))
+        ),
+        "uwy_summary": _flat(lob_uwy_summary(claims)),
+        "monthly_movements": _flat(monthly_movements(claims)),
+    }
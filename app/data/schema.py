@@ -0,0 +1,94 @@
+import logging
+
+import pandas as pd
+from shared.constants import LOB, SUBLOBS, MEASURES
+from shared.colored_logging import info, warning, debug, is_enabled
+
+# Declared dtypes of the "Final" transactions sheet. Columns with known codes
+# use fixed categories so every dataset shares the same category order;
+# references are dictionary-encoded with the codes found in the data.
+TRANSACTIONS_SCHEMA = {
+    "Final LOB": ("category", SUBLOBS),
+    "LOB": ("category", [code for lob in LOB for code in lob]),
+    "Measure": ("category", MEASURES),
+    "UWY": ("int16", None),
+    "CutOffDate": ("datetime64[ns]", None),
+    "value": ("float64", None),
+    "PolicyReference": ("category", None),
+    "ClaimReference": ("category", None),
+}
+
+# Columns identifying a transaction; a re-delivered row with the same key
+# replaces the one already stored.
+TRANSACTION_KEY = [
+    "CutOffDate",
+    "Final LOB",
+    "LOB",
+    "UWY",
+    "Measure",
+    "PolicyReference",
+    "ClaimReference",
+]
+
+
+def _to_category(series: pd.Series, categories) -> pd.Series:
+    if categories is None:
+        return series.astype("category")
+    unknown = sorted(set(series.dropna().unique()) - set(categories), key=str)
+    if unknown:
+        warning(f"Column '{series.name}' has undeclared codes {unknown}, appending them")
+    return series.astype(pd.CategoricalDtype(list(categories) + unknown))
+
+
+def _to_int(series: pd.Series, dtype: str) -> pd.Series:
+    if series.isna().any():
+        # nullable integers keep missing values instead of falling back to float
+        return series.astype(dtype.capitalize())
+    return series.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame, schema: dict = TRANSACTIONS_SCHEMA) -> pd.DataFrame:
+    """Casts the transactions columns to their declared compact dtypes."""
+    columns = {}
+    for col, (dtype, categories) in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype == "category":
+            columns[col] = _to_category(df[col], categories)
+        elif dtype.startswith("int"):
+            columns[col] = _to_int(df[col], dtype)
+        elif dtype.startswith("datetime64"):
+            columns[col] = pd.to_datetime(df[col]).astype(dtype)
+        else:
+            columns[col] = df[col].astype(dtype)
+    return df.assign(**columns)
+
+
+def memory_report(raw: pd.DataFrame, typed: pd.DataFrame) -> pd.DataFrame:
+    """Returns the per-column memory usage (bytes) before and after the schema."""
+    report = pd.DataFrame(
+        {
+            "before": raw.memory_usage(index=False, deep=True),
+            "after": typed.memory_usage(index=False, deep=True),
+        }
+    )
+    report["saved"] = report["before"] - report["after"]
+    return report
+
+
+def log_memory_report(report: pd.DataFrame, source: str):
+    """Logs the memory saved by the schema for one dataset."""
+    before, after = report["before"].sum(), report["after"].sum()
+    if before:
+        info(
+            "Typed schema for %s: %.1fMB -> %.1fMB (%.0f%% saved)",
+            source,
+            before / 1e6,
+            after / 1e6,
+            100 * (1 - after / before),
+        )
+    else:
+        info("Typed schema for %s: empty dataset", source)
+    if is_enabled(logging.DEBUG):
+        for col, col_before, col_after in report[["before", "after"]].itertuples():
+            debug("  %s: %.2fMB -> %.2fMB", col, col_before / 1e6, col_after / 1e6)
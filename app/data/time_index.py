@@ -0,0 +1,35 @@
+import pandas as pd
+
+
+def _bound(values: pd.Series, bound):
+    """Casts a range bound to the type of a datetime64 or Period column."""
+    if isinstance(values.dtype, pd.PeriodDtype):
+        return pd.Period(bound, values.dtype.freq)
+    return pd.Timestamp(bound)
+
+
+def sort_by_time(df: pd.DataFrame, column: str = "CutOffDate") -> pd.DataFrame:
+    """Returns `df` sorted by `column` (stable, so ties keep their load order)."""
+    if df[column].is_monotonic_increasing:
+        return df
+    return df.sort_values(column, kind="stable", ignore_index=True)
+
+
+def time_slice(
+    df: pd.DataFrame, column: str = "CutOffDate", start=None, end=None
+) -> pd.DataFrame:
+    """
+    Returns the rows with `start <= df[column] <= end` (`None` is open).
+
+    `df` must be sorted by `column` (see `sort_by_time`): the bounds are
+    found by binary search, so the slice costs O(log n) plus the copy of the
+    selected rows instead of a full scan.
+    """
+    values = df[column]
+    lo = 0 if start is None else values.searchsorted(_bound(values, start), side="left")
+    hi = (
+        len(df)
+        if end is None
+        else values.searchsorted(_bound(values, end), side="right")
+    )
+    return df.iloc[lo:hi]
@@ -0,0 +1,134 @@
+import threading
+import time
+
+from data.cube import get_cube
+from data.dataset import registry
+from data.history_store import history
+from data.ingestion import ingest_inputs
+from data.policy_summary import get_policy_summary
+from data.reference_index import get_reference_index
+from data.reference_search import get_reference_search
+from data.input_watcher import start_input_watcher
+from shared.colored_logging import info, error, success
+
+# derived artifacts built ahead of the first page that needs them
+WARM_ARTIFACTS = [
+    ("Aggregating the cube", get_cube),
+    ("Summarising policies", get_policy_summary),
+    ("Indexing claims", get_reference_index),
+    ("Indexing claim search", get_reference_search),
+]
+
+
+class Warmup:
+    """
+    Prepares the shared dataset of `inputs/` and its derived artifacts in a
+    background thread, so sessions attach to warm data.
+
+    `refresh()` rebuilds it after the inputs changed: the current dataset is
+    served until the new one is fully warm, then `dataset` is swapped in one
+    assignment. Pages read `progress` / `message` while the first build
+    runs (see `await_warmup`).
+    """
+
+    def __init__(self, directory: str = "inputs"):
+        self.directory = directory
+        self.progress = 0.0
+        self.message = "Waiting to start"
+        self.dataset = None
+        self.error = None
+        self._done = threading.Event()
+        self._thread = None
+        self._running = False
+        self._pending = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """True once the first build finished (successfully or not)."""
+        return self._done.is_set()
+
+    def start(self):
+        """Starts the first build, or retries it if it failed without a dataset."""
+        with self._lock:
+            if self._running or self.dataset is not None:
+                return
+            if self._thread is not None and self.error is None:
+                return  # built, but inputs/ had no workbooks
+            self._start_thread()
+
+    def refresh(self):
+        """
+        Rebuilds from the current inputs in the background. Requests made
+        while a build runs are coalesced into a single follow-up build.
+        """
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return
+            self._start_thread()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blocks until the first build finished (or `timeout` seconds passed)."""
+        return self._done.wait(timeout)
+
+    def _start_thread(self):
+        self.error = None
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def _step(self, progress: float, message: str):
+        self.progress, self.message = progress, message
+
+    def _run(self):
+        while True:
+            self._build()
+            self._done.set()
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+    def _build(self):
+        start = time.perf_counter()
+        try:
+            self._step(0.0, "Reading new workbooks")
+            ingest_inputs(self.directory)
+            if not history.months():
+                self._step(1.0, f"No data_YYYYMM workbooks in {self.directory}")
+                return
+
+            self._step(0.4, "Loading the dataset")
+            # the registry loads each store version once and retires the
+            # replaced dataset when its last session lets go of it
+            dataset = registry.acquire(history.snapshot_source(), loader=lambda _: history.load())
+            if dataset is self.dataset:
+                self._step(1.0, "Ready")
+                return
+            for i, (message, build) in enumerate(WARM_ARTIFACTS):
+                self._step(0.5 + 0.5 * i / len(WARM_ARTIFACTS), message)
+                build(dataset)
+            self.dataset = dataset
+            self._step(1.0, "Ready")
+            success(f"Dataset {dataset.source} ready in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            self.error = e
+            self._step(1.0, f"Warm-up failed: {e}")
+            error(f"Warm-up failed: {e}")
+
+
+# one warm-up per server process
+warmup = Warmup("inputs")
+
+
+def start_warmup():
+    """
+    Starts the process-wide warm-up and the watcher that refreshes it when
+    workbooks are added to or changed in its directory (no-ops once started).
+    """
+    if warmup._thread is None:
+        info("Starting warm-up of the shared dataset")
+    warmup.start()
+    start_input_watcher(warmup.directory, on_change=warmup.refresh)
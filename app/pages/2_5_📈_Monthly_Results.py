@@ -1,5 +1,6 @@
 import streamlit as st
 from presentation.state.session_state_manager import initialize_session_state
+from presentation.components.profile_panel import render_profile
 from shared.narratives import USAGE, DETAILS, NAVIGATION, DISCLAIMER
 from shared.constants import SUBLOBS, YEARS
 from shared.utils import (
@@ -12,6 +13,9 @@ from shared.utils import (
     get_custom_cutoff_quarter,
 )
 from shared.colored_logging import info, warning, error, debug, success
+from data.cube import get_cube, slice_cube
+from data.reports import lob_uwy_summary, monthly_movements
+from presentation.state.lazy import page_graph
 import pandas as pd
 import numpy as np
 
@@ -38,33 +42,47 @@ st.write(
 )
 
 
-policies_pivot = create_pivot_table(
-    st.session_state.transactions_data,
-    index=["PolicyReference"],
-    columns="Measure",
-    values="value",
+# derived tables are only computed when rendered, and again when an input changes
+graph = page_graph("monthly_results")
+dataset = st.session_state.dataset
+
+policies_pivot = graph.node(
+    "policies_pivot",
+    lambda ds: create_pivot_table(
+        ds.view(),
+        index=["PolicyReference"],
+        columns="Measure",
+        values="value",
+        fingerprint=ds.fingerprint,
+    ),
+    dataset,
 )
 
-claims_pivot = create_pivot_table(
-    st.session_state.transactions_data,
-    index=["ClaimReference"],
-    columns="Measure",
-    values="value",
+claims_pivot = graph.node(
+    "claims_pivot",
+    lambda ds: create_pivot_table(
+        ds.view(),
+        index=["ClaimReference"],
+        columns="Measure",
+        values="value",
+        fingerprint=ds.fingerprint,
+    ),
+    dataset,
 )
 
-# st.dataframe(policies_pivot)
-# st.dataframe(claims_pivot)
+# st.dataframe(policies_pivot.value())
+# st.dataframe(claims_pivot.value())
 
 
 st.write("LoB Level Summary")
-monthly_data = st.session_state.transactions_data.copy()
-monthly_data["CutOffDate"] = monthly_data["CutOffDate"].dt.strftime("%Y-%m-%d")
+cube = get_cube(dataset)
 
 
-@st.cache_data(ttl=60)
-def get_monthly_data(month):
-    return st.session_state.transactions_data.query(
-        f"CutOffDate >= '{get_custom_cutoff_month(date=st.session_state.current_date, actual_month=month)}'"
+def get_monthly_data(ds, month, current_date):
+    # a binary-searched window of the shared (in-memory, sorted) dataset: no
+    # disk read, and always the same version as the rest of the page
+    return ds.between(
+        start=get_custom_cutoff_month(date=current_date, actual_month=month)
     )
 
 
@@ -75,7 +93,13 @@ st.selectbox(
     index=int(get_month(st.session_state.current_date)) - 1,
 )
 
-monthly_data = get_monthly_data(month=st.session_state.selected_month)
+monthly_data = graph.node(
+    "monthly_data",
+    get_monthly_data,
+    dataset,
+    st.session_state.selected_month,
+    st.session_state.current_date,
+)
 
 st.write(
     f"Showing data from {get_custom_cutoff_month(date=st.session_state.current_date, actual_month=st.session_state.selected_month)} onwards"
@@ -85,31 +109,40 @@ st.write(
 #     monthly_data["CutOffDate"] > get_last_month_cutoff(st.session_state.current_date)
 # ]
 
-monthly_pivot = create_pivot_table(
-    monthly_data,
-    index=["UWY"],
-    columns="Final LOB",
-    values="value",
-    fill_value=0,
-    aggfunc="sum",
+monthly_pivot = graph.node(
+    "monthly_pivot",
+    lambda ds, month, current_date: create_pivot_table(
+        slice_cube(
+            get_cube(ds),
+            start_month=get_custom_cutoff_month(date=current_date, actual_month=month),
+        ),
+        index=["UWY"],
+        columns="Final LOB",
+        values="value",
+        fill_value=0,
+        aggfunc="sum",
+    ),
+    dataset,
+    st.session_state.selected_month,
+    st.session_state.current_date,
 )
 
-st.dataframe(monthly_data.head())
-# st.dataframe(monthly_pivot)
+st.dataframe(monthly_data.value().head())
+# st.dataframe(monthly_pivot.value())
 
-with st.expander("See Summary by policy level"):
-    lob_policy_pivot = create_pivot_table(
-        st.session_state.transactions_data,
-        index=["LOB"],
-        columns="Measure",
-        values="value",
-    )
-    st.dataframe(lob_policy_pivot)
+lob_policy_pivot = graph.node(
+    "lob_policy_pivot",
+    lambda ds: create_pivot_table(
+        get_cube(ds), index=["LOB"], columns="Measure", values="value"
+    ),
+    dataset,
+)
+
+# a toggle rather than an expander: expander bodies run even when collapsed
+if st.toggle("See Summary by policy level", key="show_lob_policy_pivot_month"):
+    st.dataframe(lob_policy_pivot.value())
 
-policies_movement = st.session_state.transactions_data.copy()
-policies_movement = policies_movement[
-    policies_movement["Measure"].isin(["GClmO", "GClmP"])
-]
+policies_movement = slice_cube(cube, measures=["GClmO", "GClmP"])
 
 
 uwy_selector = st.multiselect(
@@ -133,29 +166,26 @@ if not selected_uwy:
 if not selected_lob:
     selected_lob = policies_movement["Final LOB"].unique()
 
-filtered_data = policies_movement[
-    (policies_movement["UWY"].isin(selected_uwy))
-    & (policies_movement["Final LOB"].isin(selected_lob))
-]
-
-filtered_pivot = create_pivot_table(
-    policies_movement,
-    index=[
-        "Final LOB",
-        "UWY",
-    ],
-    columns="Measure",
-    values="value",
-    fill_value=0,
-    aggfunc="sum",
+filtered_data = graph.node(
+    "filtered_data",
+    lambda ds, lobs, uwys: slice_cube(
+        get_cube(ds), measures=["GClmO", "GClmP"], final_lobs=lobs, uwys=uwys
+    ),
+    dataset,
+    selected_lob,
+    selected_uwy,
 )
+
+filtered_pivot = graph.node("filtered_pivot", lob_uwy_summary, filtered_data)
 # filtered_pivot = filtered_pivot.unstack(level=-1).reset_index()
 
-st.dataframe(filtered_pivot)
+st.dataframe(filtered_pivot.value())
 
-filtered_pivot["Month"] = filtered_pivot["CutOffDate"].dt.to_period("M")
+monthly_movement_pivot = graph.node(
+    "monthly_movement_pivot", monthly_movements, filtered_data
+)
 
-st.dataframe(filtered_pivot)
+st.dataframe(monthly_movement_pivot.value())
 
 # filtered_pivot = filtered_pivot.groupby(["UWY", "Final LOB", "Month"])[
 #     ["value"]
@@ -164,3 +194,5 @@ st.dataframe(filtered_pivot)
 # filtered_pivot["Change"] = filtered_pivot["value"].diff().fillna(0)
 # filtered_pivot = filtered_pivot.sort_values(by=["UWY", "Final LOB", "Month"])
 # st.dataframe(filtered_pivot)
+
+render_profile()
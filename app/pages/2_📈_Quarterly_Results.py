@@ -1,5 +1,6 @@
 import streamlit as st
 from presentation.state.session_state_manager import initialize_session_state
+from presentation.components.profile_panel import render_profile
 from shared.narratives import USAGE, DETAILS, NAVIGATION, DISCLAIMER
 from shared.constants import SUBLOBS, YEARS, formats
 from shared.utils import (
@@ -9,6 +10,10 @@ from shared.utils import (
     get_custom_cutoff_quarter,
 )
 from shared.colored_logging import info, warning, error, debug, success
+from data.cube import get_cube, slice_cube
+from data.reports import period_results
+from data.ingestion import get_summary_tables
+from presentation.state.lazy import page_graph
 import pandas as pd
 import numpy as np
 
@@ -35,34 +40,47 @@ st.write(
 )
 
 
-policies_pivot = create_pivot_table(
-    st.session_state.transactions_data,
-    index=["PolicyReference"],
-    columns="Measure",
-    values="value",
+# derived tables are only computed when rendered, and again when an input changes
+graph = page_graph("quarterly_results")
+dataset = st.session_state.dataset
+
+policies_pivot = graph.node(
+    "policies_pivot",
+    lambda ds: create_pivot_table(
+        ds.view(),
+        index=["PolicyReference"],
+        columns="Measure",
+        values="value",
+        fingerprint=ds.fingerprint,
+    ),
+    dataset,
 )
 
-claims_pivot = create_pivot_table(
-    st.session_state.transactions_data,
-    index=["ClaimReference"],
-    columns="Measure",
-    values="value",
+claims_pivot = graph.node(
+    "claims_pivot",
+    lambda ds: create_pivot_table(
+        ds.view(),
+        index=["ClaimReference"],
+        columns="Measure",
+        values="value",
+        fingerprint=ds.fingerprint,
+    ),
+    dataset,
 )
 
-# st.dataframe(policies_pivot)
-# st.dataframe(claims_pivot)
+# st.dataframe(policies_pivot.value())
+# st.dataframe(claims_pivot.value())
 
 
 st.write("LoB Level Summary")
-quarterly_data = st.session_state.transactions_data.copy()
-quarterly_data["CutOffDate"] = quarterly_data["CutOffDate"].dt.strftime("%Y-%m-%d")
 
 
-@st.cache_data(ttl=60)
-def get_quarterly_data(quarter):
+def get_quarterly_data(ds, quarter, current_date):
     info(f"Filtering data for quarter: {quarter}")
-    return st.session_state.transactions_data.query(
-        f"CutOffDate >= '{get_custom_cutoff_quarter(date=st.session_state.current_date, actual_quarter=quarter)}'"
+    return slice_cube(
+        get_cube(ds),
+        measures=["GClmO", "GClmP", "GGWP", "GPrmB"],
+        start_month=get_custom_cutoff_quarter(date=current_date, actual_quarter=quarter),
     )
 
 
@@ -85,23 +103,20 @@ with col2:
         index=style_options.index("thousands") if "thousands" in style_options else 0,
     )
 
-quarterly_data = get_quarterly_data(st.session_state.selected_quarter)
-quarterly_data = quarterly_data[
-    quarterly_data["Measure"].isin(["GClmO", "GClmP", "GGWP", "GPrmB"])
-]
+quarterly_data = graph.node(
+    "quarterly_data",
+    get_quarterly_data,
+    dataset,
+    st.session_state.selected_quarter,
+    st.session_state.current_date,
+)
 info(
     f"Showing data from {get_custom_cutoff_quarter(date=st.session_state.current_date, actual_quarter=st.session_state.selected_quarter)} onwards"
 )
-debug(f"Quarterly data shape after filtering: {quarterly_data.shape}")
-
-quarterly_pivot = create_pivot_table(
-    quarterly_data,
-    index=["UWY"],
-    columns=["Final LOB", "Measure"],
-    values="value",
-    fill_value=0,
-    aggfunc="sum",
-)
+
+quarterly_pivot = graph.node(
+    "quarterly_pivot", period_results, quarterly_data
+).value()
 
 # Format only numeric columns
 st.dataframe(
@@ -114,11 +129,38 @@ st.dataframe(
     )
 )
 
-with st.expander("See Summary by policy level"):
-    lob_policy_pivot = create_pivot_table(
-        st.session_state.transactions_data,
-        index=["LOB"],
-        columns="Measure",
-        values="value",
+lob_policy_pivot = graph.node(
+    "lob_policy_pivot",
+    lambda ds: create_pivot_table(
+        get_cube(ds), index=["LOB"], columns="Measure", values="value"
+    ),
+    dataset,
+)
+
+# a toggle rather than an expander: expander bodies run even when collapsed
+if st.toggle("See Summary by policy level", key="show_lob_policy_pivot_quarter"):
+    st.dataframe(lob_policy_pivot.value())
+
+# Finance allocation tables of the Summary workbooks found in inputs/
+summary_tables = get_summary_tables()
+if summary_tables and st.toggle("See Finance Summary tables", key="show_finance_summary"):
+    col1, col2 = st.columns(2)
+    with col1:
+        workbook = st.selectbox(
+            "Select Finance Summary workbook",
+            options=sorted(summary_tables),
+            key="selected_summary_workbook",
+        )
+    with col2:
+        table_name = st.selectbox(
+            "Select Summary table",
+            options=list(summary_tables[workbook]),
+            key="selected_summary_table",
+        )
+    st.dataframe(
+        summary_tables[workbook][table_name].style.format(
+            formats[st.session_state.get("selected_style_quarter", "thousands")]
+        )
     )
-    st.dataframe(lob_policy_pivot)
+
+render_profile()
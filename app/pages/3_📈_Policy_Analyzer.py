@@ -1,9 +1,10 @@
 import streamlit as st
 from presentation.state.session_state_manager import initialize_session_state
+from presentation.components.profile_panel import render_profile
 from shared.narratives import USAGE, DETAILS, NAVIGATION, DISCLAIMER
 from shared.constants import SUBLOBS, YEARS
 from shared.colored_logging import info, warning, error, debug, success
-from shared.utils import create_pivot_table
+from data.policy_summary import get_policy_summary, policy_page, policy_detail
 import pandas as pd
 import numpy as np
 
@@ -29,21 +30,62 @@ st.write(
     "This page provides a shotcut to analyze policy-level data. It is based on the transactions data imported in the previous page."
 )
 
-st.selectbox(
-    "Select policy to analyze",
-    options=st.session_state.transactions_data["ClaimReference"].unique(),
+summary = get_policy_summary(st.session_state.dataset)
+PAGE_SIZE = 50
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.text_input(
+        "Filter policies (substring, case-insensitive)",
+        value="",
+        key="policy_search",
+    )
+with col2:
+    sort_options = ["PolicyReference"] + summary.columns.tolist()
+    st.selectbox("Sort by", options=sort_options, key="policy_sort_by")
+with col3:
+    st.radio(
+        "Order", options=["Ascending", "Descending"], key="policy_order", horizontal=True
+    )
+
+policies_page, n_pages = policy_page(
+    st.session_state.dataset,
+    page=st.session_state.get("policy_page", 1),
+    page_size=PAGE_SIZE,
+    sort_by=(
+        None
+        if st.session_state.policy_sort_by == "PolicyReference"
+        else st.session_state.policy_sort_by
+    ),
+    ascending=st.session_state.policy_order == "Ascending",
+    search=st.session_state.policy_search,
 )
 
+with col4:
+    st.number_input(
+        f"Page (of {n_pages})",
+        min_value=1,
+        max_value=n_pages,
+        value=min(st.session_state.get("policy_page", 1), n_pages),
+        step=1,
+        key="policy_page",
+    )
 
-policies_pivot = create_pivot_table(
-    st.session_state.transactions_data,
-    index=["PolicyReference"],
-    columns="Measure",
-    values="value",
-)
+st.dataframe(policies_page)
 
+selected_policy = st.selectbox(
+    "Select policy to analyze",
+    options=policies_page.index.tolist(),
+    key="selected_policy",
+)
 
-st.dataframe(policies_pivot)
+# the drill-down is only computed for the selected policy
+if selected_policy is not None:
+    detail = policy_detail(st.session_state.dataset, selected_policy)
+    st.write(f"Claims of policy **{selected_policy}**")
+    st.dataframe(detail["claims"])
+    st.write("Movements by cutoff date")
+    st.dataframe(detail["movements"])
 
 
 # get all simulated IBNR BE values as a dataframe with LoB and UWY as index
@@ -52,3 +94,5 @@ st.dataframe(policies_pivot)
 # )
 
 # st.dataframe(simulated_ibnr_df)
+
+render_profile()
@@ -1,12 +1,14 @@
 import streamlit as st
 from presentation.state.session_state_manager import initialize_session_state
+from presentation.components.profile_panel import render_profile
 from shared.narratives import USAGE, DETAILS, NAVIGATION, DISCLAIMER
 from shared.constants import SUBLOBS, YEARS
 from shared.colored_logging import info, warning, error, debug, success
 from shared.utils import create_pivot_table
+from data.reference_index import get_reference_index
+from data.reference_search import get_reference_search
 import pandas as pd
 import numpy as np
-import re
 import plotly.express as px
 
 st.set_page_config(page_title="Claim Analyzer Tool", page_icon="📈", layout="wide")
@@ -29,7 +31,10 @@ st.sidebar.markdown(DISCLAIMER)
 st.write(
     "This page provides a shotcut to analyze claims-level data. It is based on the transactions data imported in the previous page."
 )
-ALL_CLAIMS = st.session_state.transactions_data["ClaimReference"].dropna().unique()
+reference_index = get_reference_index(st.session_state.dataset)
+ALL_CLAIMS = reference_index.claims
+claim_search = get_reference_search(st.session_state.dataset, "ClaimReference")
+MAX_DISPLAYED_MATCHES = 50
 st.multiselect(
     "Select claim(s) to analyze",
     options=ALL_CLAIMS,
@@ -55,14 +60,17 @@ with st.expander("Multiple Claims selection help"):
         .upper()
     )
 
-    if string_match:
-        pattern = re.compile(string_match, re.IGNORECASE)
-        filtered_claims_match = [
-            claim for claim in ALL_CLAIMS if pattern.search(str(claim))
-        ]
+    # the text is matched literally: every match filters the data, and only
+    # the best matches are ranked and displayed
+    filtered_claims_match = claim_search.matches(string_match).tolist()
+    displayed_claims_match = claim_search.search(string_match, limit=MAX_DISPLAYED_MATCHES)
 
-        st.write(f"Claims matching '{string_match}': {filtered_claims_match}")
-    else:
+    if filtered_claims_match:
+        st.write(
+            f"Claims matching '{string_match}' ({len(filtered_claims_match)}): "
+            f"{displayed_claims_match}"
+        )
+    elif string_match:
         st.warning("No claims match the provided substring.")
 
 selected_claims = st.session_state.get("selected_claims", [])
@@ -73,18 +81,18 @@ if selected_claims:
     st.write(f"Selected claims: {selected_claims}")
     filtered_claims = selected_claims
 elif string_match:
-    st.write(f"Claims matching '{string_match}': {filtered_claims_match}")
+    st.write(f"Claims matching '{string_match}': {displayed_claims_match}")
     filtered_claims = filtered_claims_match
 elif not selected_claims and not string_match:
     filtered_claims = ALL_CLAIMS.tolist()
 
 if selected_claims or string_match:
-    st.write(f"Filtered claims: {filtered_claims}")
+    st.write(f"Filtered claims: {filtered_claims[:MAX_DISPLAYED_MATCHES]}")
 
 
-filtered_claims_data = st.session_state.transactions_data[
-    st.session_state.transactions_data["ClaimReference"].isin(filtered_claims)
-]
+filtered_claims_data = st.session_state.dataset.take(
+    reference_index.claim_rows(filtered_claims)
+)
 
 st.write(
     f"Showing data for {len(filtered_claims_data['ClaimReference'].unique())} claim(s) from a total of {len(ALL_CLAIMS)} claims."
@@ -107,7 +115,7 @@ df = filtered_claims_data[filtered_claims_data["Measure"].isin(["GClmP", "GClmO"
 
 # Compute cumulative sum over time
 df = df.sort_values("CutOffDate")
-df["cumulative"] = df.groupby("Measure")["value"].cumsum()
+df["cumulative"] = df.groupby("Measure", observed=True)["value"].cumsum()
 
 # Plot cumulative evolution
 fig = px.line(
@@ -128,3 +136,5 @@ if len(filtered_claims) != len(ALL_CLAIMS):
     )
 
     st.plotly_chart(fig)
+
+render_profile()
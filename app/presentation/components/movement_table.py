@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.constants import formats
+from shared.profiling import profiled
+
+# rows styled and sent to the browser per page: styling cost does not grow with the table
+PAGE_SIZE = 100
+SIGN_COLORS = ("color: green", "color: red")
+# movement tables have always shown thousands with a separator (e.g. 12,345.6k)
+MOVEMENT_FORMATS = {**formats, "thousands": lambda x: f"{x / 1e3:,.1f}k"}
+
+
+def _sign_colors(values: pd.DataFrame) -> pd.DataFrame:
+    """Green for non-negative, red for negative values, computed for the whole block at once."""
+    colors = np.where(values.to_numpy() >= 0, *SIGN_COLORS)
+    return pd.DataFrame(colors, index=values.index, columns=values.columns)
+
+
+def style_movement_table(
+    table: pd.DataFrame, style: str = "thousands", key_columns=("LOB", "UWY")
+):
+    """
+    Returns a Styler showing the numeric columns of `table` in the `style`
+    number format (see `MOVEMENT_FORMATS`), with movement columns
+    (all but `*_Total`) coloured by sign. The underlying values stay numeric.
+    """
+    value_columns = [
+        col
+        for col in table.select_dtypes(include=[np.number]).columns
+        if col not in key_columns
+    ]
+    movement_columns = [col for col in value_columns if not col.endswith("_Total")]
+    return (
+        table.style.format(MOVEMENT_FORMATS[style], subset=value_columns)
+        .apply(_sign_colors, axis=None, subset=movement_columns)
+        .hide(axis="index")
+    )
+
+
+@profiled("render_movement_table")
+def render_movement_table(
+    table: pd.DataFrame,
+    key: str,
+    style: str = "thousands",
+    key_columns=("LOB", "UWY"),
+    page_size: int = PAGE_SIZE,
+):
+    """
+    Renders a movement table one page at a time with `st.dataframe`.
+
+    Only the current page is styled, so render time stays flat however many
+    LOB x UWY rows the table has; the grid itself scrolls virtually.
+    """
+    n_pages = max(1, -(-len(table) // page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+
+    if n_pages > 1:
+        page = st.number_input(
+            f"Page (of {n_pages})",
+            min_value=1,
+            max_value=n_pages,
+            step=1,
+            key=page_key,
+        )
+    else:
+        page = 1
+
+    start = (page - 1) * page_size
+    visible = table.iloc[start : start + page_size]
+    st.dataframe(style_movement_table(visible, style, key_columns), hide_index=True)
+    if n_pages > 1:
+        st.caption(f"Rows {start + 1}-{start + len(visible)} of {len(table)}")
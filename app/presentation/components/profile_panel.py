@@ -0,0 +1,28 @@
+import pandas as pd
+import streamlit as st
+from shared import profiling
+
+
+def render_profile():
+    """
+    In debug mode, shows the profiled blocks of this rerun and the session
+    totals in the sidebar, with the session profile as a JSON download.
+    Call it last on a page: it ends the rerun's recording.
+    """
+    if not st.session_state.get("debug"):
+        return
+    records = profiling.end_run()
+    session_profile = st.session_state.setdefault("profile", profiling.SessionProfile())
+    session_profile.add(records)
+
+    with st.sidebar.expander("Profile", expanded=False):
+        st.write(f"This rerun: {sum(r.seconds for r in records if r.depth == 0):.3f}s profiled")
+        st.dataframe(pd.DataFrame([r.as_dict() for r in records]), hide_index=True)
+        st.write(f"Session ({session_profile.runs} reruns)")
+        st.dataframe(session_profile.summary())
+        st.download_button(
+            "Download session profile",
+            data=session_profile.to_json(),
+            file_name="profile.json",
+            mime="application/json",
+        )
@@ -0,0 +1,32 @@
+import streamlit as st
+from data.warmup import warmup
+
+# how often the progress bar polls the warm-up, in seconds
+POLL_SECONDS = 0.5
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _warmup_progress():
+    # only this fragment reruns while waiting; the page reruns once data is ready
+    if warmup.ready:
+        st.rerun()
+    st.progress(warmup.progress, text=f"Preparing data: {warmup.message}...")
+
+
+def await_warmup():
+    """
+    Returns the current warm dataset (None when `inputs/` has no workbooks).
+
+    While the first warm-up runs, shows its progress and stops the page: the
+    script thread is released, and the page reruns when the data is ready.
+    Stops the page with an error if the warm-up failed; a rerun retries it.
+    """
+    if not warmup.ready:
+        _warmup_progress()
+        st.stop()
+
+    # a failed refresh keeps serving the previous dataset
+    if warmup.error is not None and warmup.dataset is None:
+        st.error(f"The data could not be prepared: {warmup.error}")
+        st.stop()
+    return warmup.dataset
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from data.dataset import Dataset
+from shared.colored_logging import debug
+
+
+def _freeze(value):
+    """Returns a hashable fingerprint of a node input (dataset, widget value, node)."""
+    if isinstance(value, Node):
+        return ("node", value.name, value.key())
+    if isinstance(value, Dataset):
+        # identified by its source, which carries the dataset version
+        return ("dataset", value.source, id(value))
+    if isinstance(
+        value, (list, tuple, set, np.ndarray, pd.Index, pd.Series, pd.api.extensions.ExtensionArray)
+    ):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    hash(value)  # unhashable inputs (e.g. DataFrames) must be wrapped in a node
+    return value
+
+
+class Node:
+    """A derived table computed on first use and recomputed only when its inputs change."""
+
+    def __init__(self, graph, name: str, compute, inputs: tuple):
+        self.graph = graph
+        self.name = name
+        self._compute = compute
+        self._inputs = inputs
+
+    def key(self) -> tuple:
+        return tuple(_freeze(value) for value in self._inputs)
+
+    def value(self):
+        """Returns the node value, computing it only if an input changed since last time."""
+        key = self.key()
+        cached = self.graph.store.get(self.name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        debug("Computing page node '%s'", self.name)
+        args = [v.value() if isinstance(v, Node) else v for v in self._inputs]
+        result = self._compute(*args)
+        self.graph.store[self.name] = (key, result)
+        return result
+
+
+class LazyGraph:
+    """
+    Derived tables of a page, declared as nodes over the dataset and widget values.
+
+    Declaring a node is free: it is computed when something reads its
+    `value()`, and cached in the session until one of its inputs changes.
+    """
+
+    def __init__(self, store: dict):
+        self.store = store
+
+    def node(self, name: str, compute, *inputs) -> Node:
+        """Declares `name = compute(*inputs)`; node inputs are passed as their values."""
+        return Node(self, name, compute, inputs)
+
+
+def page_graph(page: str) -> LazyGraph:
+    """Returns the lazy graph of `page` for the current session."""
+    return LazyGraph(st.session_state.setdefault(f"lazy_graph:{page}", {}))
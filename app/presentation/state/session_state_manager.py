@@ -1,40 +1,78 @@
+import argparse
+import uuid
+
+import pandas as pd
 import streamlit as st
 from datetime import datetime
-import pandas as pd
-import os
+from data.warmup import start_warmup
+from presentation.components.warmup_progress import await_warmup
+from shared import profiling
+from shared.colored_logging import set_thread_level
+
+# Every page imports this module before touching data. Copy-on-write lets the shared dataset
+# and the pivot cache hand out shallow copies that pages can modify safely.
+pd.set_option("mode.copy_on_write", True)
 
-files = {}
+# the shared dataset is prepared in the background (and refreshed when inputs/
+# changes). `app/serve.py` starts it before the server accepts connections;
+# under plain `streamlit run` it starts here, on the first import.
+start_warmup()
 
-for file in os.listdir("inputs"):
-    if file.endswith(".xlsx") and file.startswith("data_202509"):
-        files[file] = os.path.join("inputs", file)
+
+def _debug_flag() -> bool:
+    """Returns the `--debug` flag of `streamlit run app/app.py -- --debug`."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--debug", action="store_true")
+    return parser.parse_known_args()[0].debug
+
+
+def _session_author() -> str:
+    """Identifies who edits in this session: the signed-in user, else an anonymous session id."""
+    if st.user.get("is_logged_in"):
+        return st.user.get("email") or st.user.get("name")
+    return f"session-{uuid.uuid4().hex[:8]}"
 
 
 def initialize_session_state(debug: bool = False):
-    """Initialize or retrieve the session state with repositories and services."""
+    """
+    Initialize or retrieve the session state with repositories and services.
+    Debug mode is on when the server was started with `--debug` (or `debug` is passed),
+    on whichever page the session starts.
+    """
 
     # Get current date information
     now = datetime.now()
     current_date = now.strftime("%Y-%m-%d")
     time = now.strftime("%H:%M:%S")
 
-    st.session_state.setdefault("debug", debug)
+    if "debug" not in st.session_state:
+        st.session_state.debug = debug or _debug_flag()
     st.session_state.setdefault("current_date", current_date)
     st.session_state.setdefault("time", time)
+    # recorded with the comments this session saves (see `CommentStore.upsert`)
+    if "author" not in st.session_state:
+        st.session_state.author = _session_author()
 
     st.session_state.setdefault("transactions_file", None)
+    st.session_state.setdefault("dataset", None)
     st.session_state.setdefault("transactions_data", None)
 
-    # import data if not already in session state and cache them in session state
-    if st.session_state.transactions_data is None:
-        st.session_state.transactions_file = files.get("data_202509.xlsx", None)
-
-        st.session_state.transactions_data = (
-            pd.read_excel(
-                st.session_state.transactions_file,
-                sheet_name="Final",
-                engine="openpyxl",
-            )
-            if st.session_state.transactions_file
-            else None
-        )
+    # in debug mode, this session's debug messages are logged (the level is
+    # set for the rerun's script thread only) and every rerun records its
+    # profiled blocks (see `render_profile`)
+    set_thread_level("DEBUG" if st.session_state.debug else None)
+    if st.session_state.debug:
+        profiling.start_run()
+
+    # attach the process-wide shared dataset; the session only keeps a read-only view.
+    # Each rerun picks up the latest dataset, so a refresh triggered by new
+    # workbooks reaches the session on its next rerun; the previous version
+    # stays alive while another session still holds it.
+    start_warmup()  # retries a failed warm-up
+    dataset = await_warmup()
+    if dataset is not None and dataset is not st.session_state.dataset:
+        if st.session_state.dataset is not None:
+            st.toast(f"Data updated to {dataset.period}")
+        st.session_state.dataset = dataset
+        st.session_state.transactions_file = dataset.source
+        st.session_state.transactions_data = dataset.view()
@@ -0,0 +1,136 @@
+"""
+Builds the month-end or quarter-end report pack of every LOB without Streamlit.
+
+The transactions are loaded once (through the history store, like the app),
+aggregated into the cube, and the per-LOB reports are built and written by a
+process pool. Run from the repository root:
+
+    python app/report_pack.py --freq Q --formats parquet excel html --output reports
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from data.cube import get_cube
+from data.dataset import registry
+from data.history_store import history
+from data.ingestion import ingest_inputs
+from data.reports import lob_report
+from shared.colored_logging import info, error, success
+
+FORMATS = ["parquet", "excel", "html"]
+
+# set in each worker by `_init_worker`, so the cube is sent once per process
+_cube = None
+
+
+def load_cube(inputs: str = "inputs") -> pd.DataFrame:
+    """Ingests new workbooks of `inputs` and returns the cube of the full history."""
+    ingest_inputs(inputs)
+    if not history.months():
+        raise FileNotFoundError(f"No data_YYYYMM workbooks found in {inputs}")
+    dataset = registry.acquire(history.snapshot_source(), loader=lambda _: history.load())
+    return get_cube(dataset)
+
+
+def write_report(tables: dict, directory: str, name: str, formats) -> list:
+    """Writes the `tables` of one report in each of `formats`; returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    if "parquet" in formats:
+        for table_name, table in tables.items():
+            path = os.path.join(directory, f"{name}_{table_name}.parquet")
+            table.to_parquet(path, engine="pyarrow", index=False)
+            paths.append(path)
+    if "excel" in formats:
+        path = os.path.join(directory, f"{name}.xlsx")
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            for table_name, table in tables.items():
+                table.to_excel(writer, sheet_name=table_name[:31], index=False)
+        paths.append(path)
+    if "html" in formats:
+        path = os.path.join(directory, f"{name}.html")
+        sections = [
+            f"<h2>{table_name}</h2>\n{table.to_html(index=False, float_format='{:,.2f}'.format)}"
+            for table_name, table in tables.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<html><body>\n<h1>{name}</h1>\n" + "\n".join(sections) + "\n</body></html>")
+        paths.append(path)
+    return paths
+
+
+def _init_worker(cube: pd.DataFrame):
+    global _cube
+    _cube = cube
+
+
+def _build_lob(final_lob: str, freq: str, n_periods: int, as_of, output: str, formats) -> list:
+    tables = lob_report(_cube, final_lob, freq=freq, n_periods=n_periods, as_of=as_of)
+    return write_report(tables, output, final_lob, formats)
+
+
+def run(
+    inputs: str = "inputs",
+    output: str = "reports",
+    freq: str = "Q",
+    n_periods: int = 1,
+    formats=("parquet",),
+    lobs=None,
+    workers: int = None,
+) -> list:
+    """Builds and writes the report of every LOB (or of `lobs`); returns the paths written."""
+    start = time.perf_counter()
+    cube = load_cube(inputs)
+    lobs = lobs or cube["Final LOB"].unique().tolist()
+    # one reported period for the whole pack, not the latest of each LOB
+    as_of = cube["Month"].max().asfreq(freq)
+    output = os.path.join(output, str(as_of))
+    info(f"Building {len(lobs)} LOB report(s) into {output}")
+
+    paths = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(cube,)
+    ) as pool:
+        futures = {
+            pool.submit(_build_lob, lob, freq, n_periods, as_of, output, formats): lob
+            for lob in lobs
+        }
+        for future in as_completed(futures):
+            try:
+                paths.extend(future.result())
+            except Exception as e:
+                error(f"Report of {futures[future]} failed: {e}")
+    success(f"Wrote {len(paths)} file(s) in {time.perf_counter() - start:.2f}s")
+    return paths
+
+
+def main():
+    # shallow copies of the shared dataset and cached pivots (inherited by workers)
+    pd.set_option("mode.copy_on_write", True)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inputs", default="inputs", help="directory of data_YYYYMM workbooks")
+    parser.add_argument("--output", default="reports", help="directory of the report pack")
+    parser.add_argument("--freq", choices=["M", "Q"], default="Q", help="month- or quarter-end pack")
+    parser.add_argument("--periods", type=int, default=1, help="number of movement periods")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["parquet"])
+    parser.add_argument("--lob", nargs="*", help="Final LOBs to report (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPUs)")
+    args = parser.parse_args()
+
+    run(
+        inputs=args.inputs,
+        output=args.output,
+        freq=args.freq,
+        n_periods=args.periods,
+        formats=args.formats,
+        lobs=args.lob,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Starts the Streamlit server with the shared dataset already warming up.
+
+`streamlit run` only imports the app when the first browser connects, so
+the warm-up would start with the first visitor. This launcher starts it
+first, then runs the server in the same process (the pages find the warm-up
+in `sys.modules`). Run from the repository root:
+
+    python app/serve.py [--debug]
+
+Streamlit options (`--server.port 8502`, `--server.headless=true`) are
+applied like `streamlit run` does; other arguments are passed to the app.
+"""
+
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+import pandas as pd  # noqa: E402
+from streamlit.web import bootstrap  # noqa: E402
+
+
+def _parse_value(value: str):
+    """Types a command line option value as the `streamlit run` flags do."""
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return int(value) if value.isdigit() else value
+
+
+def _split_args(argv: list) -> tuple:
+    """Splits `argv` into Streamlit config options ({"server_port": "8502"}) and app arguments."""
+    flag_options, app_args = {}, []
+    argv = list(argv)
+    while argv:
+        arg = argv.pop(0)
+        name = arg[2:].split("=", 1)[0]
+        if arg.startswith("--") and "." in name:
+            value = arg.split("=", 1)[1] if "=" in arg else argv.pop(0)
+            flag_options[name.replace(".", "_")] = _parse_value(value)
+        else:
+            app_args.append(arg)
+    return flag_options, app_args
+
+
+def main():
+    # as in session_state_manager: the warm-up hands out shallow copies
+    pd.set_option("mode.copy_on_write", True)
+
+    from data.warmup import start_warmup
+
+    start_warmup()
+    flag_options, app_args = _split_args(sys.argv[1:])
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(os.path.join(APP_DIR, "app.py"), False, app_args, flag_options)
+
+
+if __name__ == "__main__":
+    main()
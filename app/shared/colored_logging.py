@@ -1,6 +1,25 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
 from datetime import datetime
 
+# SUCCESS sits between INFO and WARNING
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# JSON lines log written next to the console output ("" disables it); the
+# file is only created when the first record is written (see `set_json_path`)
+LOG_JSON_PATH = os.environ.get("LOG_JSON_PATH", os.path.join("logs", "app.jsonl"))
+
+_logger = logging.getLogger("reserving_tools")
+_logger.propagate = False
+
 
 # Define ANSI escape codes for colors.
 # This class makes it easy to reference the colors by name.
@@ -20,52 +39,197 @@ class Color:
     RESET = "\033[0m"  # Resets color to default
 
 
-def _log(message: str, color: str):
+_LEVEL_COLORS = {
+    logging.DEBUG: Color.DEBUG,
+    logging.INFO: Color.INFO,
+    SUCCESS: Color.SUCCESS,
+    logging.WARNING: Color.WARNING,
+    logging.ERROR: Color.ERROR,
+}
+
+
+class ColorFormatter(logging.Formatter):
+    """Formats records as `[timestamp]: LEVEL: message` in the level's color."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        color = _LEVEL_COLORS.get(record.levelno, "")
+        timestamp = "[{0:%Y-%m-%d %H:%M:%S}]".format(datetime.fromtimestamp(record.created))
+        return f"{color}{timestamp}: {record.levelname}: {record.getMessage()}{Color.RESET}"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, with their structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+
+class _JsonLinesFileHandler(logging.FileHandler):
+    """A file handler that creates its file (and directory) on the first record."""
+
+    def __init__(self, path: str):
+        super().__init__(path, encoding="utf-8", delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+    def handleError(self, record):
+        pass  # e.g. a read-only working directory: the console still logs
+
+
+def _handlers() -> list:
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(ColorFormatter())
+    handlers = [console]
+    if LOG_JSON_PATH:
+        json_lines = _JsonLinesFileHandler(LOG_JSON_PATH)
+        json_lines.setFormatter(JsonLinesFormatter())
+        handlers.append(json_lines)
+    return handlers
+
+
+class _Backend:
+    """
+    Callers only put records on a queue; a listener thread formats and
+    writes them, so logging never blocks the calling (script) thread on I/O.
+    The listener and its handlers start with the first record logged.
     """
-    The core function to print a colored message to the terminal.
 
-    This function handles the actual printing, applying the color code
-    before the message and the reset code after it.
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.listener = None
+        self._lock = threading.Lock()
+        _logger.addHandler(logging.handlers.QueueHandler(self.queue))
+
+    def start(self):
+        with self._lock:
+            if self.listener is None:
+                self.listener = logging.handlers.QueueListener(self.queue, *_handlers())
+                self.listener.start()
+
+    def stop(self):
+        """Writes the queued records, stops the listener thread and closes its handlers."""
+        with self._lock:
+            if self.listener is not None:
+                self.listener.stop()
+                for handler in self.listener.handlers:
+                    handler.close()
+                self.listener = None
+
+    def restart_in_child(self):
+        # a forked process (e.g. a report pack worker) has no listener thread
+        self._lock = threading.Lock()
+        self.queue = queue.SimpleQueue()
+        _logger.handlers[0].queue = self.queue
+        self.listener = None
 
-    Args:
-        message (str): The log message to display.
-        color (str): The ANSI color code from the Color class.
+
+_backend = _Backend()
+atexit.register(_backend.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_backend.restart_in_child)
+
+# server-wide minimum level; a thread may override it (see `set_thread_level`)
+_level = logging.INFO
+_local = threading.local()
+# filtering is done by `is_enabled`, so the logger itself lets everything through
+_logger.setLevel(logging.DEBUG)
+
+
+def _to_level(level) -> int:
+    return logging.getLevelName(level.upper()) if isinstance(level, str) else level
+
+
+def set_level(level):
+    """Sets the server-wide minimum level logged (a name such as "DEBUG" or a number)."""
+    global _level
+    _level = _to_level(level)
+
+
+set_level(LOG_LEVEL)
+
+
+def set_thread_level(level=None):
+    """
+    Overrides the minimum level for the messages logged by the calling
+    thread, e.g. the script thread of a debug session's rerun; `None`
+    falls back to the server-wide level.
+    """
+    _local.level = _to_level(level) if level is not None else None
+
+
+def set_json_path(path: str):
+    """Writes the JSON lines log to `path` from the next record on ("" disables it)."""
+    global LOG_JSON_PATH
+    _backend.stop()
+    LOG_JSON_PATH = path
+
+
+def is_enabled(level: int) -> bool:
+    override = getattr(_local, "level", None)
+    return level >= (override if override is not None else _level)
+
+
+def flush():
+    """Blocks until every queued record is written."""
+    _backend.stop()
+    _backend.start()
+
+
+def _log(level: int, message, args: tuple, fields: dict):
+    """
+    Queues a record if `level` is enabled. Nothing is formatted otherwise:
+    `message` may be a %-style format with `args`, or a callable returning
+    the message. `fields` are added to the JSON line (e.g. timings).
     """
-    # Print the colored message to standard output.
-    # The `f-string` combines the color code, message, and reset code.
-    timestamp = "[{0:%Y-%m-%d %H:%M:%S}]".format(datetime.now())
-    print(f"{color}{timestamp}: {message}{Color.RESET}", file=sys.stdout)
+    if not is_enabled(level):
+        return
+    if _backend.listener is None:
+        _backend.start()
+    if callable(message):
+        message = message()
+    _logger.log(level, message, *args, extra={"fields": fields})
 
 
-def info(message: str):
+def info(message, *args, **fields):
     """Logs an informational message in blue."""
-    _log(f"INFO: {message}", Color.INFO)
+    _log(logging.INFO, message, args, fields)
 
 
-def warning(message: str):
+def warning(message, *args, **fields):
     """Logs a warning message in yellow."""
-    _log(f"WARNING: {message}", Color.WARNING)
+    _log(logging.WARNING, message, args, fields)
 
 
-def error(message: str):
+def error(message, *args, **fields):
     """Logs an error message in red."""
-    _log(f"ERROR: {message}", Color.ERROR)
+    _log(logging.ERROR, message, args, fields)
 
 
-def debug(message: str):
+def debug(message, *args, **fields):
     """Logs a debug message in cyan."""
-    _log(f"DEBUG: {message}", Color.DEBUG)
+    _log(logging.DEBUG, message, args, fields)
 
 
-def success(message: str):
+def success(message, *args, **fields):
     """Logs a success message in green."""
-    _log(f"SUCCESS: {message}", Color.SUCCESS)
+    _log(SUCCESS, message, args, fields)
 
 
 # Example usage:
 if __name__ == "__main__":
     # You can call these functions directly from your code.
+    set_level("DEBUG")
     info("Application has started successfully.")
     warning("This is an important warning to consider.")
     error("An unhandled exception occurred.")
-    debug("This is a detailed debug message for developers.")
+    debug("Loaded %d rows", 1000, elapsed_ms=12.5)
+    debug(lambda: "This is a detailed debug message for developers.")
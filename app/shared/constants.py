@@ -1,3 +1,5 @@
+import os
+
 LOB = [
     {"ENTOT": "Energy"},
     {"LITOT": "Life"},
@@ -25,8 +27,13 @@ SUBLOBS = [
     "DCFRO",
 ]
 
+MEASURES = ["GClmO", "GClmP", "GGWP", "GPrmB"]
+
 YEARS = [2017, 2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025]
 
+# memory budget of the process-wide pivot cache (shared.pivot_cache), in bytes
+PIVOT_CACHE_MAX_BYTES = int(os.environ.get("PIVOT_CACHE_MAX_MB", "256")) * 1024**2
+
 formats = {
     "millions": lambda x: f"{x / 1e6:.1f}m",
     "default": lambda x: f"{x:.2f}",
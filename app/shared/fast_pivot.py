@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# index cardinality from which `sum` pivots skip `DataFrame.pivot_table`
+HIGH_CARDINALITY_THRESHOLD = 1000
+
+
+def _single_key(keys):
+    if isinstance(keys, str):
+        return keys
+    if isinstance(keys, (list, tuple)) and len(keys) == 1:
+        return keys[0]
+    return None
+
+
+def _encode(column: pd.Series):
+    """Returns integer codes (-1 for missing) and the labels they refer to."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    codes, uniques = pd.factorize(column, sort=True)
+    return codes, uniques
+
+
+def _observed_labels(column: pd.Series, labels, observed: np.ndarray) -> pd.Index:
+    """Builds the result axis the way `pivot_table(observed=True)` labels it."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = np.flatnonzero(observed)
+        return pd.CategoricalIndex(
+            pd.Categorical.from_codes(codes, dtype=column.dtype), name=column.name
+        )
+    return pd.Index(labels[observed], name=column.name)
+
+
+def high_cardinality_pivot(df: pd.DataFrame, index, columns, values, aggfunc, fill_value):
+    """
+    Sums `values` by one `index` key and one `columns` key with a single
+    scatter over integer codes, instead of `pivot_table`'s hash groupby,
+    reindex and fill.
+
+    Returns the same table as `pivot_table(..., observed=True)`, or None
+    when the pivot is not eligible (other aggregation, several keys,
+    non-float values or an index with fewer than
+    HIGH_CARDINALITY_THRESHOLD keys) so the caller can fall back.
+    """
+    index, columns = _single_key(index), _single_key(columns)
+    if aggfunc != "sum" or index is None or columns is None or not isinstance(values, str):
+        return None
+    if not pd.api.types.is_float_dtype(df[values].dtype):
+        return None
+    try:
+        row_codes, row_labels = _encode(df[index])
+        col_codes, col_labels = _encode(df[columns])
+    except TypeError:  # unsortable mixed-type keys
+        return None
+    if len(row_labels) < HIGH_CARDINALITY_THRESHOLD:
+        return None
+
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    row_codes, col_codes = row_codes[valid], col_codes[valid]
+    weights = np.nan_to_num(df[values].to_numpy()[valid], nan=0.0)
+
+    # keep only the keys observed with a valid counterpart, as pivot_table does
+    row_observed = np.bincount(row_codes, minlength=len(row_labels)) > 0
+    col_observed = np.bincount(col_codes, minlength=len(col_labels)) > 0
+    row_codes = (np.cumsum(row_observed) - 1)[row_codes]
+    col_codes = (np.cumsum(col_observed) - 1)[col_codes]
+    n_rows, n_cols = int(row_observed.sum()), int(col_observed.sum())
+
+    flat = row_codes.astype(np.int64) * n_cols + col_codes
+    sums = np.bincount(flat, weights=weights, minlength=n_rows * n_cols)
+    present = np.bincount(flat, minlength=n_rows * n_cols) > 0
+    table = np.where(present, sums, np.nan if fill_value is None else fill_value)
+
+    return pd.DataFrame(
+        table.reshape(n_rows, n_cols),
+        index=_observed_labels(df[index], row_labels, row_observed),
+        columns=_observed_labels(df[columns], col_labels, col_observed),
+    )
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from shared.constants import PIVOT_CACHE_MAX_BYTES
+from shared.colored_logging import debug
+
+
+def _as_tuple(value):
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+def frame_fingerprint(df: pd.DataFrame, columns) -> str:
+    """Hashes the content of `columns` of `df` (categoricals are hashed by value)."""
+    used = df[list(columns)]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(c, str(t)) for c, t in used.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(used, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def pivot_key(df, index, columns, values, aggfunc, fill_value, fingerprint=None):
+    """
+    Returns the cache key of a pivot, or None when it cannot be cached.
+
+    Only named aggregations (e.g. "sum") are cached: a callable has no
+    stable identity across reruns.
+    """
+    if not isinstance(aggfunc, str):
+        return None
+    index, columns, values = _as_tuple(index), _as_tuple(columns), _as_tuple(values)
+    if fingerprint is None:
+        fingerprint = frame_fingerprint(df, dict.fromkeys(index + columns + values))
+    return (fingerprint, index, columns, values, aggfunc, fill_value)
+
+
+def _private_copy(table: pd.DataFrame) -> pd.DataFrame:
+    """A copy of a cached table that the caller may modify freely."""
+    return table.copy(deep=not pd.get_option("mode.copy_on_write"))
+
+
+class PivotCache:
+    """
+    Process-wide LRU cache of pivot tables under a memory budget (bytes).
+
+    Entries are shared by all sessions; callers receive copies so the
+    cached tables can never be modified: shallow ones when copy-on-write is
+    enabled, full ones otherwise.
+    """
+
+    def __init__(self, max_bytes: int = PIVOT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _size(result: pd.DataFrame) -> int:
+        return int(result.memory_usage(index=True, deep=True).sum())
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute) -> pd.DataFrame:
+        """Returns the cached pivot of `key`, computing and storing it on a miss."""
+        if key is None:
+            return compute()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _private_copy(self._entries[key][0])
+            self.misses += 1
+
+        result = compute()
+        size = self._size(result)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (result, size)
+                self._bytes += size
+                self._evict()
+        debug(lambda: f"Pivot cache miss ({size / 1e6:.2f}MB), {self.stats()}")
+        return _private_copy(result)
+
+    def resize(self, max_bytes: int):
+        """Changes the memory budget, evicting the least recently used entries."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+pivot_cache = PivotCache()
@@ -0,0 +1,208 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from shared.colored_logging import debug
+
+# the run being recorded on this thread (one Streamlit rerun), if any
+_state = threading.local()
+
+
+class Record:
+    """Wall time, rows in/out and peak traced memory of one profiled block."""
+
+    __slots__ = ("name", "seconds", "rows_in", "rows_out", "peak_bytes", "depth")
+
+    def __init__(self, name: str, rows_in=None, depth: int = 0):
+        self.name = name
+        self.seconds = 0.0
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak_bytes = None
+        self.depth = depth
+
+    def as_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+# threads whose current run traces memory; tracemalloc is process-wide, so it
+# is started by the first of them and stopped when none is left
+_tracing_threads = set()
+_tracing_lock = threading.Lock()
+_started_tracing = False
+
+
+def _release_tracing(thread=None):
+    """Forgets `thread` and finished threads; stops tracemalloc if no traced run remains."""
+    global _started_tracing
+    with _tracing_lock:
+        _tracing_threads.discard(thread)
+        # a rerun stopped early (e.g. `st.stop()`) never calls `end_run`
+        _tracing_threads.difference_update([t for t in _tracing_threads if not t.is_alive()])
+        if not _tracing_threads and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def start_run(trace_memory: bool = True):
+    """Starts recording the profiled blocks run by this thread (e.g. one page rerun)."""
+    global _started_tracing
+    if trace_memory:
+        with _tracing_lock:
+            _tracing_threads.add(threading.current_thread())
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+    _state.records = []
+    _state.stack = []
+
+
+def end_run() -> list:
+    """Stops recording on this thread and returns its records, in completion order."""
+    records = getattr(_state, "records", None) or []
+    _state.records = None
+    _release_tracing(threading.current_thread())
+    return records
+
+
+def is_recording() -> bool:
+    return getattr(_state, "records", None) is not None
+
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    if isinstance(value, tuple) and value and isinstance(value[0], (pd.DataFrame, pd.Series)):
+        return len(value[0])
+    return None
+
+
+@contextmanager
+def profile(name: str, rows_in=None):
+    """
+    Times the enclosed block and records it in the current run; a no-op
+    when nothing is recording. Set `record.rows_out` inside the block.
+
+    Peak memory is the highest traced allocation above the memory in use
+    when the block started, nested blocks included. tracemalloc is
+    process-wide, so blocks of concurrent sessions share their peaks.
+    """
+    if not is_recording():
+        if _tracing_threads:
+            _release_tracing()
+        yield Record(name, rows_in)
+        return
+
+    record = Record(name, rows_in, depth=len(_state.stack))
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        start_bytes, peak = tracemalloc.get_traced_memory()
+        if _state.stack:  # keep the enclosing block's peak before resetting it
+            _state.stack[-1][1] = max(_state.stack[-1][1], peak)
+        tracemalloc.reset_peak()
+    # [record, highest absolute peak seen by finished nested blocks]
+    frame = [record, 0]
+    _state.stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+        _state.stack.pop()
+        if tracing:
+            peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+            record.peak_bytes = max(0, peak - start_bytes)
+            if _state.stack:
+                _state.stack[-1][1] = max(_state.stack[-1][1], peak)
+        if _state.records is not None:
+            _state.records.append(record)
+        debug(
+            "[profile] %s: %.1f ms, rows %s -> %s, peak %.1f MB",
+            name,
+            record.seconds * 1000,
+            record.rows_in,
+            record.rows_out,
+            (record.peak_bytes or 0) / 1e6,
+            **record.as_dict(),
+        )
+
+
+def profiled(name: str = None):
+    """
+    Decorator recording each call with `profile`. Rows in are the length of
+    the first DataFrame argument, rows out that of the returned DataFrame or
+    array (or of the first element of a returned tuple).
+    """
+
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_recording():
+                return fn(*args, **kwargs)
+            rows_in = next(
+                (len(a) for a in args if isinstance(a, (pd.DataFrame, pd.Series))), None
+            )
+            with profile(label, rows_in) as record:
+                result = fn(*args, **kwargs)
+                record.rows_out = _rows(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+_EMPTY_STATS = {
+    "calls": 0,
+    "total_s": 0.0,
+    "max_s": 0.0,
+    "rows_in": 0,
+    "rows_out": 0,
+    "max_peak_bytes": 0,
+}
+
+
+class SessionProfile:
+    """Profiled blocks of every run of a session, aggregated by name."""
+
+    def __init__(self):
+        self.runs = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def add(self, records: list):
+        with self._lock:
+            self.runs += 1
+            for record in records:
+                stats = self._stats.setdefault(record.name, dict(_EMPTY_STATS))
+                stats["calls"] += 1
+                stats["total_s"] += record.seconds
+                stats["max_s"] = max(stats["max_s"], record.seconds)
+                stats["rows_in"] += record.rows_in or 0
+                stats["rows_out"] += record.rows_out or 0
+                stats["max_peak_bytes"] = max(stats["max_peak_bytes"], record.peak_bytes or 0)
+
+    def summary(self) -> pd.DataFrame:
+        """Returns one row per profiled name, slowest (total time) first."""
+        with self._lock:
+            table = pd.DataFrame.from_dict(self._stats, orient="index")
+        if table.empty:
+            return table
+        table["mean_s"] = table["total_s"] / table["calls"]
+        return table.sort_values("total_s", ascending=False)
+
+    def to_json(self) -> str:
+        with self._lock:
+            return json.dumps({"runs": self.runs, "blocks": self._stats}, indent=2)
+
+    def dump(self, path: str):
+        """Writes the aggregated profile to `path` as JSON."""
+        with open(path, "w") as f:
+            f.write(self.to_json())
@@ -1,23 +1,55 @@
+import calendar
+
 import pandas as pd
 from shared.colored_logging import info, warning, error, debug, success
+from shared.pivot_cache import pivot_cache, pivot_key
+from shared.fast_pivot import high_cardinality_pivot
+from shared.profiling import profile
 
 
 def create_pivot_table(
-    df: pd.DataFrame, index, columns, values, aggfunc="sum", fill_value=0
+    df: pd.DataFrame,
+    index,
+    columns,
+    values,
+    aggfunc="sum",
+    fill_value=0,
+    fingerprint=None,
 ):
-    """Creates a pivot table from the given DataFrame."""
-    debug(f"DataFrame shape before pivot: {df.shape}")
+    """
+    Creates a pivot table from the given DataFrame.
+
+    Pivots are memoized process-wide (see `shared.pivot_cache`), keyed by the
+    content of the columns used and the pivot arguments. Callers that know
+    the identity of `df` (e.g. a whole shared dataset) can pass it as
+    `fingerprint` to skip hashing the data.
+    """
+    debug("DataFrame shape before pivot: %s", df.shape)
     debug(
-        f"Creating pivot table with index={index}, columns={columns}, values={values}"
+        "Creating pivot table with index=%s, columns=%s, values=%s", index, columns, values
     )
 
-    pivot_df = df.pivot_table(
-        index=index,
-        columns=columns,
-        values=values,
-        aggfunc=aggfunc,
-        fill_value=fill_value,
-    )
+    def compute():
+        # policy/claim-level pivots take a code-based path with identical output
+        pivot_df = high_cardinality_pivot(
+            df, index, columns, values, aggfunc, fill_value
+        )
+        if pivot_df is not None:
+            debug("Using the high-cardinality pivot path")
+            return pivot_df
+        return df.pivot_table(
+            index=index,
+            columns=columns,
+            values=values,
+            aggfunc=aggfunc,
+            fill_value=fill_value,
+            observed=True,
+        )
+
+    with profile(f"create_pivot_table({index} x {columns})", rows_in=len(df)) as record:
+        key = pivot_key(df, index, columns, values, aggfunc, fill_value, fingerprint)
+        pivot_df = pivot_cache.get_or_compute(key, compute)
+        record.rows_out = len(pivot_df)
     return pivot_df
 
 
@@ -38,26 +70,12 @@ def get_quarter(date):
 
 def get_last_quarter_cutoff(date: str):
     """Returns the last quarter cutoff date given a date."""
-    year = get_year(date)
-    month = int(get_month(date))
-    if month in [1, 2, 3]:
-        return f"{int(year) - 1}-12-31"
-    elif month in [4, 5, 6]:
-        return f"{year}-03-31"
-    elif month in [7, 8, 9]:
-        return f"{year}-06-30"
-    else:
-        return f"{year}-09-30"
+    return f"{last_quarter_cutoff(date):%Y-%m-%d}"
 
 
 def get_last_month_cutoff(date: str):
     """Returns the last month cutoff date given a date."""
-    year = get_year(date)
-    month = int(get_month(date))
-    if month == 1:
-        return f"{int(year) - 1}-12-31"
-    else:
-        return f"{year}-{month - 1:02d}-31"
+    return f"{last_month_cutoff(date):%Y-%m-%d}"
 
 
 def get_custom_cutoff_month(date: str, actual_month: int):
@@ -73,3 +91,68 @@ def get_custom_cutoff_quarter(date: str, actual_quarter: int):
     assert actual_quarter in [1, 2, 3, 4], "Quarter must be between 1 and 4"
     actual_month = (actual_quarter - 1) * 3 + 1
     return get_custom_cutoff_month(date, actual_month)
+
+
+# =============================================================
+# Vectorized date / period helpers. They accept a scalar (date string,
+# Timestamp or Period), a datetime64 or Period Series, or a DatetimeIndex /
+# PeriodIndex, and return the same kind of container.
+_PERIOD_LABEL_FORMATS = {"M": "%Y-%m", "Q": "%FQ%q", "Y": "%F"}
+
+
+def _dt(values):
+    """Returns the accessor exposing datetime/period methods for `values`."""
+    return values.dt if isinstance(values, pd.Series) else values
+
+
+def to_datetime(dates):
+    """Converts dates or periods (start of period) to datetime64, normalized to midnight."""
+    if isinstance(dates, pd.Period) or isinstance(
+        getattr(dates, "dtype", None), pd.PeriodDtype
+    ):
+        dates = _dt(dates).to_timestamp(how="start")
+    else:
+        dates = pd.to_datetime(dates)
+    return _dt(dates).normalize()
+
+
+def month_end(dates):
+    """Returns the last day of the month of each date."""
+    return to_datetime(dates) + pd.offsets.MonthEnd(0)
+
+
+def quarter_end(dates):
+    """Returns the last day of the calendar quarter of each date."""
+    return to_datetime(dates) + pd.offsets.QuarterEnd(0, startingMonth=12)
+
+
+def last_month_cutoff(dates):
+    """Returns the end of the month preceding each date (e.g. 2025-03-15 -> 2025-02-28)."""
+    return month_end(dates) - pd.offsets.MonthEnd(1)
+
+
+def last_quarter_cutoff(dates):
+    """Returns the end of the quarter preceding each date (e.g. 2025-05-10 -> 2025-03-31)."""
+    return quarter_end(dates) - pd.offsets.QuarterEnd(1, startingMonth=12)
+
+
+def _period_freq(freq: str, fiscal_year_end: int) -> str:
+    if freq == "M":
+        return "M"
+    return f"{freq}-{calendar.month_abbr[fiscal_year_end].upper()}"
+
+
+def fiscal_period(dates, freq: str = "Q", fiscal_year_end: int = 12):
+    """
+    Buckets dates into monthly ("M"), quarterly ("Q") or yearly ("Y") periods.
+
+    Quarters and years follow a fiscal year ending in `fiscal_year_end`
+    (12 = calendar year, 3 = fiscal year ending in March, ...).
+    """
+    return _dt(to_datetime(dates)).to_period(_period_freq(freq, fiscal_year_end))
+
+
+def period_labels(dates, freq: str = "Q", fiscal_year_end: int = 12):
+    """Returns labels like "2025-09", "2025Q3" or "2025" (fiscal year) for each date."""
+    periods = fiscal_period(dates, freq=freq, fiscal_year_end=fiscal_year_end)
+    return _dt(periods).strftime(_PERIOD_LABEL_FORMATS[freq])
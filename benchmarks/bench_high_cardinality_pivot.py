@@ -0,0 +1,62 @@
+"""
+Benchmarks the high-cardinality pivot path against DataFrame.pivot_table.
+
+Run from the repository root:
+
+    python benchmarks/bench_high_cardinality_pivot.py --rows 1000000 10000000
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from synthetic import make_transactions
+from shared.fast_pivot import high_cardinality_pivot  # noqa: E402
+
+
+def _time(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'index':>16} {'keys':>9} {'pivot_table':>12} {'fast':>9} {'speedup':>8}")
+    for n_rows in args.rows:
+        df = make_transactions(n_rows, n_policies=n_rows // 20, n_claims=n_rows // 10)
+        for index in ["PolicyReference", "ClaimReference"]:
+            slow, expected = _time(
+                lambda: df.pivot_table(
+                    index=[index],
+                    columns="Measure",
+                    values="value",
+                    aggfunc="sum",
+                    fill_value=0,
+                    observed=True,
+                ),
+                args.repeat,
+            )
+            fast, result = _time(
+                lambda: high_cardinality_pivot(
+                    df, [index], "Measure", "value", "sum", 0
+                ),
+                args.repeat,
+            )
+            pd.testing.assert_frame_equal(expected, result)
+            print(
+                f"{n_rows:>12,} {index:>16} {len(expected):>9,} "
+                f"{slow:>11.3f}s {fast:>8.3f}s {slow / fast:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
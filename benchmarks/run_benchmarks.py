@@ -0,0 +1,185 @@
+"""
+Times the ingestion and aggregation hot paths on synthetic transactions and
+saves the results as JSON, so runs of different commits can be compared.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --rows 100000 1000000 10000000
+    python benchmarks/run_benchmarks.py --rows 100000 --compare benchmarks/results/<previous>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from synthetic import make_transactions, write_summary_workbook
+
+from data.cube import build_cube  # noqa: E402
+from data.dataset import Dataset, load_transactions  # noqa: E402
+from data.movements import compute_movements  # noqa: E402
+from data.reference_index import ReferenceIndex  # noqa: E402
+from data.schema import apply_schema  # noqa: E402
+from helper_functions import load_input_tables  # noqa: E402
+from shared.pivot_cache import pivot_cache  # noqa: E402
+from shared.utils import create_pivot_table  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# the Excel writer is far too slow (and the sheet too small) beyond this
+EXCEL_MAX_ROWS = 100_000
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _uncached_pivot(df, index, columns="Measure"):
+    pivot_cache.clear()
+    return create_pivot_table(df, index=index, columns=columns, values="value")
+
+
+def benchmarks(df: pd.DataFrame, workdir: str, excel: bool = True) -> dict:
+    """Returns {name: zero-argument callable} for one synthetic transactions table."""
+    parquet_path = os.path.join(workdir, "transactions.parquet")
+    df.to_parquet(parquet_path, engine="pyarrow", index=False)
+    dataset = Dataset("data_202509.parquet", df)
+    cube = build_cube(dataset)
+    claims = df["ClaimReference"].cat.categories
+    selection = claims[np.linspace(0, len(claims) - 1, 100, dtype=int)]
+    index = ReferenceIndex(dataset.view())
+
+    cases = {
+        "load_parquet": lambda: Dataset(
+            "data_202509.parquet", apply_schema(pd.read_parquet(parquet_path, engine="pyarrow"))
+        ),
+        "build_cube": lambda: build_cube(dataset),
+        "pivot_policy": lambda: _uncached_pivot(df, ["PolicyReference"]),
+        "pivot_claim": lambda: _uncached_pivot(df, ["ClaimReference"]),
+        "pivot_lob_uwy": lambda: _uncached_pivot(df, ["Final LOB", "UWY"]),
+        "pivot_lob_uwy_month": lambda: _uncached_pivot(cube, ["Final LOB", "UWY"], "Month"),
+        "movements_month": lambda: compute_movements(cube, freq="M", n_periods=3),
+        "movements_quarter": lambda: compute_movements(cube, freq="Q", n_periods=3),
+        "movements_transactions": lambda: compute_movements(
+            df, time_column="CutOffDate", freq="Q"
+        ),
+        "claim_filter_isin": lambda: df[df["ClaimReference"].isin(selection)],
+        "claim_index_build": lambda: ReferenceIndex(dataset.view()),
+        "claim_filter_index": lambda: dataset.take(index.claim_rows(selection)),
+    }
+
+    if excel and len(df) <= EXCEL_MAX_ROWS:
+        excel_path = os.path.join(workdir, "data_202509.xlsx")
+        df.to_excel(excel_path, sheet_name="Final", index=False)
+
+        def load_excel_cold():
+            for entry in os.listdir(os.path.join(workdir, ".cache", "workbooks")):
+                os.remove(os.path.join(workdir, ".cache", "workbooks", entry))
+            load_transactions(excel_path)
+
+        load_transactions(excel_path)  # creates the cache directory
+        cases["load_excel_cold"] = load_excel_cold
+        cases["load_excel_cached"] = lambda: load_transactions(excel_path)
+    return cases
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: list, baseline_path: str):
+    """Prints the ratio of each timing to the same benchmark in `baseline_path`."""
+    with open(baseline_path, "r") as f:
+        baseline = {
+            (r["benchmark"], r["rows"]): r["seconds"] for r in json.load(f)["results"]
+        }
+    print(f"\n{'benchmark':>24} {'rows':>12} {'before':>9} {'after':>9} {'ratio':>7}")
+    for r in results:
+        before = baseline.get((r["benchmark"], r["rows"]))
+        if before:
+            print(
+                f"{r['benchmark']:>24} {r['rows']:>12,} {before:>8.3f}s "
+                f"{r['seconds']:>8.3f}s {r['seconds'] / before:>6.2f}x"
+            )
+
+
+def main():
+    pd.set_option("mode.copy_on_write", True)  # as in the app
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="run only these benchmarks")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # keeps the workbook cache out of the repository
+        try:
+            # load_input_tables does not depend on the transactions volume
+            if not args.only or "load_input_tables" in args.only:
+                summary_path = os.path.join(workdir, "summary.xlsx")
+                write_summary_workbook(summary_path)
+                seconds = _time(lambda: load_input_tables(summary_path), args.repeat)
+                results.append({"benchmark": "load_input_tables", "rows": 0, "seconds": seconds})
+                print(f"{'load_input_tables':>24} {'-':>12} {seconds:>8.3f}s")
+
+            for n_rows in args.rows:
+                df = make_transactions(n_rows)
+                excel = not args.only or any(name.startswith("load_excel") for name in args.only)
+                for name, fn in benchmarks(df, workdir, excel=excel).items():
+                    if args.only and name not in args.only:
+                        continue
+                    seconds = _time(fn, args.repeat)
+                    results.append({"benchmark": name, "rows": n_rows, "seconds": seconds})
+                    print(f"{name:>24} {n_rows:>12,} {seconds:>8.3f}s")
+        finally:
+            os.chdir(cwd)
+
+    commit = _commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
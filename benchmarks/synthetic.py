@@ -0,0 +1,86 @@
+"""
+Synthetic inputs for the benchmarks: "Final"-sheet transactions and
+Finance allocation workbooks shaped like the real ones.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from helper_functions import SUMMARY_TABLES  # noqa: E402
+from shared.constants import MEASURES, SUBLOBS, YEARS  # noqa: E402
+
+
+def make_transactions(
+    n_rows: int,
+    n_policies: int = None,
+    n_claims: int = None,
+    n_months: int = 24,
+    last_month: str = "2025-09",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Returns `n_rows` transactions with the columns of the "Final" sheet.
+
+    Keys are categorical, as loaded by the app. Policies default to one per
+    20 rows and claims to one per 10 rows; cutoff dates are the month ends
+    of the `n_months` months up to `last_month`.
+    """
+    rng = np.random.default_rng(seed)
+    n_policies = n_policies or max(1, n_rows // 20)
+    n_claims = n_claims or max(1, n_rows // 10)
+
+    sublob_codes = rng.integers(0, len(SUBLOBS), n_rows)
+    lob_codes = [sublob[:2] + "TOT" for sublob in SUBLOBS]
+    lobs = list(dict.fromkeys(lob_codes))
+    month_ends = pd.period_range(end=last_month, periods=n_months, freq="M").to_timestamp(
+        how="end"
+    ).normalize()
+
+    return pd.DataFrame(
+        {
+            "Final LOB": pd.Categorical.from_codes(sublob_codes, categories=SUBLOBS),
+            "LOB": pd.Categorical.from_codes(
+                np.array([lobs.index(code) for code in lob_codes])[sublob_codes],
+                categories=lobs,
+            ),
+            "UWY": np.asarray(YEARS, dtype="int16")[rng.integers(0, len(YEARS), n_rows)],
+            "Measure": pd.Categorical.from_codes(
+                rng.integers(0, len(MEASURES), n_rows), categories=MEASURES
+            ),
+            "value": rng.normal(0, 1e5, n_rows).round(2),
+            "CutOffDate": month_ends[rng.integers(0, n_months, n_rows)],
+            "PolicyReference": pd.Categorical.from_codes(
+                rng.integers(0, n_policies, n_rows),
+                categories=[f"P{i:08d}" for i in range(n_policies)],
+            ),
+            "ClaimReference": pd.Categorical.from_codes(
+                rng.integers(0, n_claims, n_rows),
+                categories=[f"C{i:08d}" for i in range(n_claims)],
+            ),
+        }
+    )
+
+
+SUMMARY_LOBS = [
+    "ENOFF", "ENONS", "ENCON", "ENOTH", "LIIND", "LIMLT", "LISHT", "PRTOT",
+    "DCBON", "DCMAR", "DCFIL", "DCFRO", "DCSPE", "DCLIA", "DCPRO", "DCENR",
+]  # fmt: skip
+
+
+def write_summary_workbook(path: str, seed: int = 0):
+    """Writes a Finance allocation workbook whose "Summary" sheet holds the five 10 x 17 tables."""
+    rng = np.random.default_rng(seed)
+    sheet = np.full((60, 40), None, dtype=object)
+    for start_row, start_col in SUMMARY_TABLES.values():
+        sheet[start_row, start_col] = "UWY"
+        sheet[start_row, start_col + 1 : start_col + 17] = SUMMARY_LOBS
+        for i, year in enumerate(range(2016, 2025), start=1):
+            sheet[start_row + i, start_col] = year
+            sheet[start_row + i, start_col + 1 : start_col + 17] = rng.normal(0, 1e6, 16).round(2)
+    pd.DataFrame(sheet).to_excel(path, sheet_name="Summary", header=False, index=False)
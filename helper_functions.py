@@ -1,44 +1,100 @@
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+
+# (start_row, start_col) of the 10 x 17 tables of the Summary sheet, 0-based:
+# a header row of LOBs above nine UWY rows (2016 to 2024), UWYs in the first column
+SUMMARY_TABLES = {
+    "GEP": (5, 2),
+    "GClmP": (20, 2),
+    "GClmO": (35, 2),
+    "IBNR BE": (50, 2),
+    "IBNR Stat": (50, 22),
+}
+SUMMARY_TABLE_SHAPE = (10, 17)
+
+SUBCLASS_GROUPS = {
+    "ENTOT": ["ENOFF", "ENONS", "ENCON", "ENOTH"],
+    "LITOT": ["LIIND", "LIMLT", "LISHT"],
+    "DCTOT": ["DCBON", "DCMAR", "DCFIL", "DCFRO", "DCSPE", "DCLIA", "DCPRO", "DCENR"],
+}
+
+
+def _read_summary_range(input_file, first_row, last_row, first_col, last_col) -> np.ndarray:
+    """Streams only the given 0-based cell range of the Summary sheet into an object array."""
+    workbook = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        if "Summary" not in workbook.sheetnames:
+            raise ValueError(f"{input_file} has no 'Summary' sheet")
+        rows = workbook["Summary"].iter_rows(
+            min_row=first_row + 1,
+            max_row=last_row + 1,
+            min_col=first_col + 1,
+            max_col=last_col + 1,
+            values_only=True,
+        )
+        cells = np.full((last_row - first_row + 1, last_col - first_col + 1), None, dtype=object)
+        for i, row in enumerate(rows):
+            cells[i, : len(row)] = row
+        return cells
+    finally:
+        workbook.close()
+
+
+def _parse_table(table_name: str, block: np.ndarray) -> pd.DataFrame:
+    """Validates one 10 x 17 block and returns its UWY x LOB values as numbers."""
+    header, years, values = block[0, 1:], block[1:, 0], block[1:, 1:]
+
+    lobs = [lob for lob in header if lob is not None]
+    missing = [lob for group in SUBCLASS_GROUPS.values() for lob in group if lob not in lobs]
+    if missing:
+        raise ValueError(f"Summary table '{table_name}' is missing LOB columns {missing}")
+    if len(set(lobs)) != len(lobs):
+        raise ValueError(f"Summary table '{table_name}' has duplicated LOB columns")
+    if not all(isinstance(year, (int, float)) and float(year).is_integer() for year in years):
+        raise ValueError(f"Summary table '{table_name}' has non-numeric UWYs {list(years)}")
+    # an object index of int UWYs, as pd.read_excel returns it
+    years = pd.Index([int(year) for year in years], dtype=object)
+    if list(years[:2]) != [2016, 2017]:
+        raise ValueError(f"Summary table '{table_name}' must start with UWYs 2016 and 2017")
+
+    # one conversion for the whole block; text and empty cells become NaN
+    numbers = pd.to_numeric(pd.Series(values.ravel()), errors="coerce").to_numpy(float)
+    table = pd.DataFrame(
+        numbers.reshape(values.shape),
+        index=years,
+        columns=pd.Index(header, name=block[0, 0]),
+    )
+    # pd.read_excel reads whole numbers as ints, so columns of whole numbers
+    # only (no empty or text cells) are int64, as in the per-column conversion
+    whole = np.isfinite(numbers) & (numbers == np.floor(numbers))
+    int_columns = table.columns[whole.reshape(values.shape).all(axis=0)]
+    return table.astype(dict.fromkeys(int_columns, "int64"))
 
 
 def load_input_tables(input_file):
     """loads the tables from the Summary sheet of the input file (Finance allocation file)"""
-    raw_df = pd.read_excel(input_file, sheet_name="Summary", header=None)
-
-    n_rows = 10
-    n_cols = 17
-    table_ranges = {
-        "GEP": (5, 2),  # (start_row, start_col)
-        "GClmP": (20, 2),
-        "GClmO": (35, 2),
-        "IBNR BE": (50, 2),
-        "IBNR Stat": (50, 22),
-    }
+    n_rows, n_cols = SUMMARY_TABLE_SHAPE
+    first_row = min(row for row, _ in SUMMARY_TABLES.values())
+    last_row = max(row for row, _ in SUMMARY_TABLES.values()) + n_rows - 1
+    first_col = min(col for _, col in SUMMARY_TABLES.values())
+    last_col = max(col for _, col in SUMMARY_TABLES.values()) + n_cols - 1
+    cells = _read_summary_range(input_file, first_row, last_row, first_col, last_col)
 
     tables = {}
-    for table_name, (start_row, start_col) in table_ranges.items():
-        t = raw_df.iloc[start_row : start_row + n_rows, start_col : start_col + n_cols]
-        t = t.reset_index(drop=True).set_index(t.columns[0])
-        t.index.name = None
-        t.columns = t.iloc[0]
-        t = t[1:]
-
-        for col in t.columns:
-            t[col] = pd.to_numeric(t[col], errors="coerce")
+    for table_name, (start_row, start_col) in SUMMARY_TABLES.items():
+        row, col = start_row - first_row, start_col - first_col
+        t = _parse_table(table_name, cells[row : row + n_rows, col : col + n_cols])
 
         # replace 2017 by 2017 & prior
         t.loc[2017] += t.loc[2016]
-        t = t[1:]
+        t = t.iloc[1:]
 
         # group subclasses
-        t["ENTOT"] = t[["ENOFF", "ENONS", "ENCON", "ENOTH"]].sum(axis=1)
-        t["LITOT"] = t[["LIIND", "LIMLT", "LISHT"]].sum(axis=1)
-        t["DCTOT"] = t[
-            ["DCBON", "DCMAR", "DCFIL", "DCFRO", "DCSPE", "DCLIA", "DCPRO", "DCENR"]
-        ].sum(axis=1)
-
-        t.fillna(0, inplace=True)
-        tables[table_name] = t
+        for group, subclasses in SUBCLASS_GROUPS.items():
+            t[group] = t[subclasses].sum(axis=1)
+
+        tables[table_name] = t.fillna(0)
 
     return tables
 
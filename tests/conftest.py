@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app imports its packages (`data`, `shared`, `presentation`) from app/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
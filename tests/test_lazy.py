@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from presentation.state.lazy import LazyGraph, _freeze
+
+
+def test_freeze_pandas_arrays():
+    lobs = pd.Series(["ENOFF", "LIIND", "ENOFF"], dtype="category")
+    for value in (
+        lobs.unique(),  # Categorical
+        pd.array([2019, 2020, None], dtype="Int64"),
+        pd.Index(["ENOFF", "LIIND"]),
+        np.array([2019, 2020]),
+    ):
+        hash(_freeze(value))
+    assert _freeze(lobs.unique()) == _freeze(["ENOFF", "LIIND"])
+
+
+def test_node_with_categorical_input_is_cached():
+    calls = []
+    graph = LazyGraph({})
+    lobs = pd.Series(["ENOFF", "LIIND"], dtype="category").unique()
+    node = graph.node("lobs", lambda values: calls.append(1) or len(values), lobs)
+    assert node.value() == 2
+    assert node.value() == 2
+    assert len(calls) == 1